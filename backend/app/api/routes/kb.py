@@ -8,10 +8,12 @@ from app.schemas.document import (
     DocumentMetadata
 )
 from app.core.auth import User
-from app.core.deps import get_current_user
+from app.core.deps import get_current_user, get_services, get_vector_store
+from app.core.services import ServiceContainer
 from app.services.document_processor import DocumentProcessor, EmbeddingService
-from app.services.vector_store import QdrantVectorStore
+from app.services.vector_store import VectorStore
 from app.core.config import settings
+import asyncio
 import uuid
 from datetime import datetime
 
@@ -19,16 +21,6 @@ router = APIRouter(prefix="/kb", tags=["knowledge-base"])
 
 # Initialize services
 doc_processor = DocumentProcessor(settings.upload_dir)
-embedding_service = EmbeddingService(settings.text_embedding_model)
-
-
-async def get_vector_store() -> QdrantVectorStore:
-    """Get vector store instance"""
-    return QdrantVectorStore(
-        settings.qdrant_url, 
-        settings.qdrant_api_key,
-        cloud_inference=settings.qdrant_cloud_inference
-    )
 
 
 async def process_document_background(
@@ -38,18 +30,20 @@ async def process_document_background(
     file_type: str,
     uploader_id: str,
     tags: List[str],
-    vector_store: QdrantVectorStore
+    vector_store: VectorStore,
+    embedding_service: EmbeddingService
 ):
     """Background task to process document"""
     try:
         # Update status to processing
         collection_name = "documents"
         
-        # Extract text
-        text = doc_processor.extract_text(file_path, file_type)
-        
-        # Chunk text
-        chunks = doc_processor.chunk_text(
+        # Extract and chunk text in a thread - PDF parsing would block the event loop
+        loop = asyncio.get_event_loop()
+        text = await loop.run_in_executor(None, doc_processor.extract_text, file_path, file_type)
+        chunks = await loop.run_in_executor(
+            None,
+            doc_processor.chunk_text,
             text,
             settings.chunk_size,
             settings.chunk_overlap
@@ -104,16 +98,16 @@ async def process_document_background(
                 texts=chunk_texts  # Pass text for cloud embedding
             )
         else:
-            # Generate embeddings locally
+            # Generate embeddings locally, off the event loop (worker processes when configured)
             chunk_texts = [chunk["text"] for chunk in chunks]
-            embeddings = embedding_service.embed_text(chunk_texts)
+            embeddings = await embedding_service.embed_array_async(chunk_texts)
             
-            await vector_store.create_collection(text_collection, len(embeddings[0]))
+            await vector_store.create_collection(text_collection, embeddings.shape[1])
             
             # Prepare payloads
             payloads = []
             ids = []
-            for chunk, embedding in zip(chunks, embeddings):
+            for chunk in chunks:
                 chunk_id = f"{doc_id}_chunk_{chunk['chunk_index']}"
                 ids.append(chunk_id)
                 payloads.append({
@@ -179,9 +173,10 @@ async def upload_document(
     file: UploadFile = File(...),
     tags: str = "",  # Comma-separated tags
     current_user: User = Depends(get_current_user),
-    vector_store: QdrantVectorStore = Depends(get_vector_store)
+    services: ServiceContainer = Depends(get_services)
 ):
     """Upload a document"""
+    vector_store = services.vector_store
     # Check permission
     if not current_user.permissions.can_upload_documents:
         raise HTTPException(
@@ -245,7 +240,8 @@ async def upload_document(
         file_ext,
         current_user.user_id,
         tag_list,
-        vector_store
+        vector_store,
+        services.embedding_service
     )
     
     return DocumentUploadResponse(
@@ -259,7 +255,7 @@ async def upload_document(
 @router.get("/documents", response_model=DocumentListResponse)
 async def list_documents(
     current_user: User = Depends(get_current_user),
-    vector_store: QdrantVectorStore = Depends(get_vector_store)
+    vector_store: VectorStore = Depends(get_vector_store)
 ):
     """List all documents"""
     # This is simplified - in a real implementation, you'd paginate and filter
@@ -274,7 +270,7 @@ async def list_documents(
 async def get_document_status(
     doc_id: str,
     current_user: User = Depends(get_current_user),
-    vector_store: QdrantVectorStore = Depends(get_vector_store)
+    vector_store: VectorStore = Depends(get_vector_store)
 ):
     """Get document processing status"""
     collection_name = "documents"
@@ -301,7 +297,7 @@ async def get_document_status(
 async def delete_document(
     doc_id: str,
     current_user: User = Depends(get_current_user),
-    vector_store: QdrantVectorStore = Depends(get_vector_store)
+    vector_store: VectorStore = Depends(get_vector_store)
 ):
     """Delete a document"""
     if not current_user.permissions.can_upload_documents:
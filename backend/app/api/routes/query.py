@@ -2,75 +2,14 @@
 from fastapi import APIRouter, Depends, HTTPException, status
 from app.schemas.query import QueryRequest, QueryResponse, FeedbackRequest, ModeOverrideRequest
 from app.core.auth import User
-from app.core.deps import get_current_user
-from app.services.rag import RAGService
+from app.core.deps import get_current_user, get_agent_service
 from app.services.agent import AgenticRAG
-from app.services.context_evaluator import ContextEvaluator
-from app.services.semantic_cache import SemanticCache
-from app.services.vector_store import QdrantVectorStore
-from app.services.llm import GroqLLMService
-from app.services.search import PerplexitySearchService
-from app.services.document_processor import EmbeddingService
-from app.core.config import settings
 import uuid
 from datetime import datetime
 
 router = APIRouter(prefix="/query", tags=["query"])
 
 
-async def get_agent_service() -> AgenticRAG:
-    """Get Agentic RAG service with all components"""
-    # Initialize real services
-    vector_store = QdrantVectorStore(
-        settings.qdrant_url, 
-        settings.qdrant_api_key,
-        cloud_inference=settings.qdrant_cloud_inference
-    )
-    llm_service = GroqLLMService(settings.groq_api_key)
-    
-    # Initialize search service only if API key is available
-    if settings.perplexity_api_key:
-        search_service = PerplexitySearchService(settings.perplexity_api_key)
-    else:
-        # Use mock search service if Perplexity key is not configured
-        from app.services.mock_search import MockSearchService
-        search_service = MockSearchService()
-    
-    # Embedding service
-    embedding_service = EmbeddingService(settings.text_embedding_model)
-    
-    # RAG service
-    rag_service = RAGService(
-        vector_store=vector_store,
-        llm_service=llm_service,
-        search_service=search_service,
-        embedding_service=embedding_service,
-        org_id=settings.org_id
-    )
-    
-    # Context evaluator
-    context_evaluator = ContextEvaluator(llm_service)
-    
-    # Semantic cache
-    semantic_cache = SemanticCache(
-        vector_store=vector_store,
-        embedding_service=embedding_service,
-        org_id=settings.org_id,
-        similarity_threshold=0.95,
-        ttl_hours=24
-    )
-    
-    # Initialize cache collection
-    await semantic_cache.initialize()
-    
-    # Agentic RAG
-    return AgenticRAG(
-        rag_service=rag_service,
-        context_evaluator=context_evaluator,
-        semantic_cache=semantic_cache
-    )
-
-
 @router.post("/", response_model=QueryResponse)
 async def query(
     request: QueryRequest,
@@ -3,75 +3,15 @@ from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.responses import StreamingResponse
 from app.schemas.query import QueryRequest
 from app.core.auth import User
-from app.core.deps import get_current_user
-from app.services.vector_store import QdrantVectorStore
-from app.services.llm import GroqLLMService
-from app.services.search import PerplexitySearchService
-from app.services.document_processor import EmbeddingService
-from app.services.rag import RAGService
-from app.services.context_evaluator import ContextEvaluator
-from app.services.semantic_cache import SemanticCache
-from app.core.config import settings
+from app.core.deps import get_current_user, get_llm_services
+from app.core.services import ServiceContainer
+from app.services.query_context import QueryContext
 import json
 import time
 import asyncio
 
 router = APIRouter(prefix="/query", tags=["query"])
 
-# Initialize services once at module level (reused across requests)
-_services_initialized = False
-_vector_store = None
-_llm_service = None
-_search_service = None
-_embedding_service = None
-_rag_service = None
-_context_evaluator = None
-_semantic_cache = None
-
-async def get_services():
-    """Get or initialize services (singleton pattern)"""
-    global _services_initialized, _vector_store, _llm_service, _search_service
-    global _embedding_service, _rag_service, _context_evaluator, _semantic_cache
-    
-    if not _services_initialized:
-        _vector_store = QdrantVectorStore(
-            settings.qdrant_url, 
-            settings.qdrant_api_key,
-            cloud_inference=settings.qdrant_cloud_inference
-        )
-        _llm_service = GroqLLMService(settings.groq_api_key)
-        _search_service = PerplexitySearchService(settings.perplexity_api_key)
-        
-        _embedding_service = EmbeddingService(settings.text_embedding_model)
-        
-        _rag_service = RAGService(
-            vector_store=_vector_store,
-            llm_service=_llm_service,
-            search_service=_search_service,
-            embedding_service=_embedding_service,
-            org_id=settings.org_id
-        )
-        
-        _context_evaluator = ContextEvaluator(_llm_service)
-        _semantic_cache = SemanticCache(
-            vector_store=_vector_store,
-            embedding_service=_embedding_service,
-            org_id=settings.org_id
-        )
-        await _semantic_cache.initialize()
-        
-        _services_initialized = True
-    
-    return {
-        'vector_store': _vector_store,
-        'llm_service': _llm_service,
-        'search_service': _search_service,
-        'embedding_service': _embedding_service,
-        'rag_service': _rag_service,
-        'context_evaluator': _context_evaluator,
-        'semantic_cache': _semantic_cache
-    }
-
 
 def _get_suggested_modes(quality, user):
     """Get suggested search modes based on quality and permissions"""
@@ -106,33 +46,36 @@ async def stream_agent_query(
     mode: str,
     top_k: int,
     current_user: User,
+    services: ServiceContainer,
     use_mmr: bool = False,
     diversity: float = 0.5
 ):
-    """Stream query processing steps in real-time"""
+    """Stream query processing steps in real-time
+    
+    Events: `status`/`decision` progress, a `token` per answer chunk as the
+    LLM generates it, then one `result` with the full answer and sources.
+    Cache hits go straight to `result`.
+    """
     
     def send_event(event_type: str, data: dict):
         """Helper to format SSE events"""
         return f"event: {event_type}\ndata: {json.dumps(data)}\n\n"
     
     try:
-        # Get initialized services (reused across requests)
-        init_start = time.time()
-        services = await get_services()
-        vector_store = services['vector_store']
-        llm_service = services['llm_service']
-        search_service = services['search_service']
-        embedding_service = services['embedding_service']
-        rag_service = services['rag_service']
-        context_evaluator = services['context_evaluator']
-        semantic_cache = services['semantic_cache']
-        init_time = int((time.time() - init_start) * 1000)
-        
-        # Start timing AFTER initialization
+        # Services are built once at startup (app lifespan)
         start_time = time.time()
+        vector_store = services.vector_store
+        llm_service = services.llm_service
+        search_service = services.search_service
+        embedding_service = services.embedding_service
+        rag_service = services.rag_service
+        context_evaluator = services.context_evaluator
+        semantic_cache = services.semantic_cache
+        # Query vector is computed once and shared by the cache and retrieval
+        context = QueryContext(query, embedding_service)
         
         # Step 1: Check cache
-        cache_msg = "🔍 Checking semantic cache (cloud inference - no local embedding)..." if settings.qdrant_cloud_inference else "🔍 Checking semantic cache (embedding query & searching for similar cached queries)..."
+        cache_msg = "🔍 Checking semantic cache (cloud inference - no local embedding)..." if vector_store.cloud_inference else "🔍 Checking semantic cache (embedding query & searching for similar cached queries)..."
         yield send_event("status", {
             "step": "cache_check",
             "message": cache_msg,
@@ -140,12 +83,12 @@ async def stream_agent_query(
         })
         
         cache_start = time.time()
-        cached_result = await semantic_cache.get(query, current_user.user_id)
+        cached_result = await semantic_cache.get(query, current_user.user_id, context=context)
         cache_time = int((time.time() - cache_start) * 1000)
         
         if cached_result:
             # Show breakdown for cloud inference with actual measurements
-            if settings.qdrant_cloud_inference and 'cache_latency_ms' in cached_result:
+            if vector_store.cloud_inference and 'cache_latency_ms' in cached_result:
                 qdrant_server_ms = cached_result.get('_qdrant_server_ms', 0)
                 cache_latency = cached_result.get('cache_latency_ms', cache_time)
                 network_ms = cache_latency - qdrant_server_ms if qdrant_server_ms > 0 else 0
@@ -212,7 +155,7 @@ async def stream_agent_query(
         })
         
         # Step 2: Search Qdrant (with cloud inference if enabled)
-        if settings.qdrant_cloud_inference:
+        if vector_store.cloud_inference:
             yield send_event("status", {
                 "step": "qdrant_search",
                 "message": "📚 Searching knowledge base (cloud inference - Qdrant embeds & searches)...",
@@ -227,39 +170,11 @@ async def stream_agent_query(
         
         search_start = time.time()
         filter_classified = not current_user.permissions.can_access_classified
-        collection_name = f"{settings.org_id}_text"
         
-        if settings.qdrant_cloud_inference:
-            # Cloud inference: no local embedding needed
-            results = await vector_store.search(
-                collection_name=collection_name,
-                query_vector=[],  # Not used
-                top_k=top_k,
-                filter_conditions={},
-                query_text=query,  # Qdrant handles embedding
-                use_mmr=use_mmr,
-                diversity=diversity
-            )
-            search_time = int((time.time() - search_start) * 1000)
-            
-            yield send_event("status", {
-                "step": "qdrant_done",
-                "message": f"✓ Found {len(results)} sources (cloud: {search_time}ms)",
-                "time_ms": search_time,
-                "num_sources": len(results),
-                "timestamp": time.time() - start_time
-            })
-        else:
-            # Local embedding + search
-            import asyncio
-            loop = asyncio.get_event_loop()
-            embed_start = time.time()
-            query_vector = await loop.run_in_executor(
-                None,
-                embedding_service.embed_text_query,
-                query
-            )
-            embed_time = int((time.time() - embed_start) * 1000)
+        if not vector_store.cloud_inference:
+            # Local embedding (already computed by the cache lookup)
+            await context.get_vector()
+            embed_time = context.embedding_ms
             
             yield send_event("status", {
                 "step": "embedding_done",
@@ -273,39 +188,30 @@ async def stream_agent_query(
                 "message": "📚 Searching Qdrant vector database...",
                 "timestamp": time.time() - start_time
             })
-            
-            results = await vector_store.search(
-                collection_name=collection_name,
-                query_vector=query_vector,
-                top_k=top_k,
-                use_mmr=use_mmr,
-                diversity=diversity
-            )
-            search_time = int((time.time() - search_start) * 1000)
-            
-            yield send_event("status", {
-                "step": "qdrant_done",
-                "message": f"✓ Found {len(results)} sources from Qdrant",
-                "time_ms": search_time,
-                "num_sources": len(results),
-                "timestamp": time.time() - start_time
-            })
         
-        if filter_classified:
-            results = [r for r in results if "classified" not in r["payload"].get("tags", [])]
+        # The only vector search: evaluation and the answer prompt both use it
+        retrieved = await rag_service.retrieve_local(
+            query,
+            top_k,
+            filter_classified,
+            use_mmr=use_mmr,
+            diversity=diversity,
+            context=context
+        )
+        sources = retrieved["sources"]
+        search_time = int((time.time() - search_start) * 1000)
         
-        # Convert to Source objects
-        from app.schemas.query import Source
-        sources = []
-        for result in results[:top_k]:
-            payload = result["payload"]
-            sources.append(Source(
-                doc_name=payload.get("filename", "Unknown"),
-                doc_id=payload.get("doc_id", ""),
-                chunk_text=payload.get("content", "")[:200],
-                page=payload.get("page_num"),
-                score=result["score"]
-            ))
+        yield send_event("status", {
+            "step": "qdrant_done",
+            "message": (
+                f"✓ Found {len(sources)} sources (cloud: {search_time}ms)"
+                if vector_store.cloud_inference
+                else f"✓ Found {len(sources)} sources from Qdrant"
+            ),
+            "time_ms": search_time,
+            "num_sources": len(sources),
+            "timestamp": time.time() - start_time
+        })
         
         # Step 3: Evaluate context
         yield send_event("status", {
@@ -352,7 +258,7 @@ async def stream_agent_query(
             "timestamp": time.time() - start_time
         })
         
-        # Step 5: Generate answer
+        # Step 5: Retrieve/search for the chosen mode and build the prompt
         if mode_used == "internet" or mode_used == "hybrid":
             yield send_event("status", {
                 "step": "internet_search",
@@ -362,9 +268,9 @@ async def stream_agent_query(
             
             internet_start = time.time()
             if mode_used == "internet":
-                final_result = await rag_service.query_internet(query, top_k)
+                prepared = await rag_service.prepare_internet(query, top_k)
             else:
-                final_result = await rag_service.query_hybrid(query, top_k, filter_classified)
+                prepared = await rag_service.prepare_hybrid(query, top_k, retrieved=retrieved)
             internet_time = int((time.time() - internet_start) * 1000)
             
             yield send_event("status", {
@@ -374,24 +280,40 @@ async def stream_agent_query(
                 "timestamp": time.time() - start_time
             })
         else:
-            yield send_event("status", {
-                "step": "llm_generate",
-                "message": "🤖 Generating answer with Groq LLM...",
-                "timestamp": time.time() - start_time
-            })
-            
-            llm_start = time.time()
-            final_result = await rag_service.query_local(query, top_k, filter_classified, return_timing=True)
-            llm_time = int((time.time() - llm_start) * 1000)
-            
-            yield send_event("status", {
-                "step": "llm_done",
-                "message": f"✓ Answer generated",
-                "time_ms": llm_time,
-                "timestamp": time.time() - start_time
-            })
+            prepared = await rag_service.prepare_local(query, retrieved=retrieved)
+        
+        # Step 6: Stream the answer as the LLM produces it
+        yield send_event("status", {
+            "step": "llm_generate",
+            "message": "🤖 Generating answer with Groq LLM...",
+            "timestamp": time.time() - start_time
+        })
+        
+        llm_start = time.time()
+        first_token_ms = None
+        answer_parts = []
+        async for token in rag_service.generate_stream(prepared):
+            if first_token_ms is None:
+                first_token_ms = int((time.time() - llm_start) * 1000)
+            answer_parts.append(token)
+            yield send_event("token", {"text": token})
+        llm_time = int((time.time() - llm_start) * 1000)
+        
+        yield send_event("status", {
+            "step": "llm_done",
+            "message": f"✓ Answer generated (first token after {first_token_ms or 0}ms)",
+            "time_ms": llm_time,
+            "first_token_ms": first_token_ms,
+            "timestamp": time.time() - start_time
+        })
+        
+        final_result = {
+            "answer": "".join(answer_parts),
+            "sources": prepared["sources"],
+            "mode": prepared["mode"]
+        }
         
-        # Step 6: Cache result
+        # Step 7: Cache result
         yield send_event("status", {
             "step": "caching",
             "message": "💾 Caching result...",
@@ -403,7 +325,8 @@ async def stream_agent_query(
             final_result['answer'],
             final_result['sources'],
             final_result['mode'],
-            current_user.user_id
+            current_user.user_id,
+            context=context
         )
         
         total_time = int((time.time() - start_time) * 1000)
@@ -448,7 +371,8 @@ async def stream_agent_query(
 @router.post("/stream")
 async def query_stream(
     request: QueryRequest,
-    current_user: User = Depends(get_current_user)
+    current_user: User = Depends(get_current_user),
+    services: ServiceContainer = Depends(get_llm_services)
 ):
     """Stream query processing with real-time progress updates"""
     
@@ -466,6 +390,7 @@ async def query_stream(
             mode=request.mode,
             top_k=request.top_k,
             current_user=current_user,
+            services=services,
             use_mmr=request.use_mmr,
             diversity=request.diversity
         ),
@@ -9,6 +9,19 @@ class Settings(BaseSettings):
     qdrant_url: str = "http://localhost:6333"
     qdrant_api_key: Optional[str] = None
     qdrant_cloud_inference: bool = True  # Enable cloud inference
+    qdrant_collection_profile: str = "default"  # default, scalar (int8) or binary quantization
+    qdrant_oversampling: Optional[float] = None  # Override the profile's search oversampling
+    qdrant_rescore: Optional[bool] = None  # Override the profile's rescoring with original vectors
+    qdrant_prefer_grpc: bool = False  # Search/upsert/retrieve/delete over gRPC instead of REST
+    qdrant_grpc_port: int = 6334
+    
+    # Cloud Inference HTTP Pool (one keep-alive client shared by all requests)
+    qdrant_http2: bool = True
+    qdrant_http_max_connections: int = 20
+    qdrant_http_max_keepalive: int = 10
+    qdrant_http_keepalive_expiry: float = 30.0  # Seconds an idle connection stays open
+    qdrant_http_connect_timeout: float = 5.0
+    qdrant_http_read_timeout: float = 30.0
     
     # LLM Configuration
     groq_api_key: Optional[str] = None
@@ -17,13 +30,17 @@ class Settings(BaseSettings):
     perplexity_api_key: Optional[str] = None
     
     # Mock Configuration
-    use_mock_vector_store: bool = True
+    use_mock_vector_store: bool = False  # In-process NumPy store instead of Qdrant
     use_mock_llm: bool = True
     use_mock_search: bool = True
     
+    # Local Vector Store (USE_MOCK_VECTOR_STORE=true)
+    local_store_path: Optional[str] = None  # Persist segments here; None keeps data in memory only
+    
     # Application Configuration
     environment: str = "development"
     org_id: str = "default_org"
+    warmup_max_attempts: int = 5  # Startup warmup retries (backoff up to 30s) before /health fails
     
     # File Upload
     upload_dir: str = "./uploads"
@@ -31,8 +48,27 @@ class Settings(BaseSettings):
     
     # Embedding Configuration
     text_embedding_model: str = "all-MiniLM-L6-v2"
+    embedding_backend: str = "torch"  # torch, onnx or onnx-int8 (CPU, no torch needed)
     chunk_size: int = 512
     chunk_overlap: int = 50
+    embedding_cache_size: int = 10000  # In-memory LRU entries, 0 disables the cache
+    embedding_cache_max_bytes: Optional[int] = None  # Optional byte budget (384-dim vector = 1.5KB)
+    embedding_store_path: Optional[str] = None  # SQLite file reused across ingestion runs, None disables
+    embedding_batch_max_size: int = 32  # Concurrent query embeds per model call, 0 disables batching
+    embedding_batch_max_wait_ms: float = 5.0  # Max time a query waits for others to join its batch
+    embedding_workers: int = 0  # Worker processes for document ingestion embeds, 0 encodes in-process
+    embedding_token_budget: int = 8192  # Padded tokens per forward pass for bulk embeds (length-bucketed)
+    
+    # Local Vector Index (USE_MOCK_VECTOR_STORE=true)
+    local_index: str = "flat"  # flat (exact scan), hnsw or ivfpq (compressed, needs local_store_path to save RAM)
+    local_full_scan_threshold: int = 10000  # Scan exactly when fewer points pass the filter
+    hnsw_m: int = 16
+    hnsw_ef_construct: int = 100
+    hnsw_ef_search: int = 64
+    ivfpq_nlist: int = 1024  # Coarse clusters
+    ivfpq_m: int = 48  # Bytes per vector code, must divide the vector size
+    ivfpq_nprobe: int = 32  # Clusters scanned per query
+    ivfpq_rerank: int = 100  # Candidates re-scored against full vectors
     
     class Config:
         env_file = ".env"
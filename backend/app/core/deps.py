@@ -1,7 +1,36 @@
 """Dependency injection for FastAPI routes"""
-from fastapi import Header, HTTPException, status
+from fastapi import Header, HTTPException, Request, status
 from typing import Optional
 from app.core.auth import get_user_by_token, User
+from app.core.services import ServiceContainer
+from app.services.vector_store import VectorStore
+from app.services.agent import AgenticRAG
+
+
+def get_services(request: Request) -> ServiceContainer:
+    """Service container built in the application lifespan"""
+    return request.app.state.services
+
+
+def get_vector_store(request: Request) -> VectorStore:
+    """Shared vector store"""
+    return get_services(request).vector_store
+
+
+def get_llm_services(request: Request) -> ServiceContainer:
+    """Service container for routes that generate answers, 503 if no LLM is configured"""
+    services = get_services(request)
+    if services.llm_service is None:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="LLM service is not configured (set GROQ_API_KEY)"
+        )
+    return services
+
+
+def get_agent_service(request: Request) -> AgenticRAG:
+    """Shared Agentic RAG service (requires the LLM)"""
+    return get_llm_services(request).agent
 
 
 async def get_current_user(
@@ -0,0 +1,203 @@
+"""Application service container - built once per process in the FastAPI lifespan"""
+from typing import Optional
+from app.services.vector_store import VectorStore, create_vector_store, close_http_client
+from app.services.llm import LLMService, GroqLLMService
+from app.services.search import SearchService, PerplexitySearchService
+from app.services.document_processor import EmbeddingService
+from app.services.rag import RAGService
+from app.services.context_evaluator import ContextEvaluator
+from app.services.semantic_cache import SemanticCache
+from app.services.agent import AgenticRAG
+
+
+class ServiceContainer:
+    """Long-lived services shared by every router
+
+    Building these per request meant a new Qdrant client, a new Groq client
+    and a SentenceTransformer reload on every cold `/query` call. The
+    container is created at startup, stored on `app.state.services` and
+    closed at shutdown.
+    """
+
+    def __init__(
+        self,
+        vector_store: VectorStore,
+        llm_service: Optional[LLMService],
+        search_service: SearchService,
+        embedding_service: EmbeddingService,
+        rag_service: RAGService,
+        context_evaluator: ContextEvaluator,
+        semantic_cache: SemanticCache,
+        agent: AgenticRAG
+    ):
+        self.vector_store = vector_store
+        self.llm_service = llm_service
+        self.search_service = search_service
+        self.embedding_service = embedding_service
+        self.rag_service = rag_service
+        self.context_evaluator = context_evaluator
+        self.semantic_cache = semantic_cache
+        self.agent = agent
+        # Set by warmup(); /ready reports 503 until ready is True
+        self.ready = False
+        self.warmup_ms = None
+        self.warmup_error = None  # Last attempt's error, cleared once warm
+        self.warmup_failed = False  # All attempts failed, /health reports unhealthy
+
+    @classmethod
+    async def create(cls, settings) -> "ServiceContainer":
+        """Build every service (cheap, no network or model load - see warmup)"""
+        import time
+        start = time.time()
+
+        vector_store = create_vector_store(settings)
+        # Without a Groq key the app still boots; routes that need the LLM return 503
+        if settings.groq_api_key:
+            llm_service = GroqLLMService(settings.groq_api_key)
+        else:
+            print("[SERVICES] GROQ_API_KEY not set - LLM routes disabled")
+            llm_service = None
+
+        # Use mock search service if Perplexity key is not configured
+        if settings.perplexity_api_key:
+            search_service = PerplexitySearchService(settings.perplexity_api_key)
+        else:
+            from app.services.mock_search import MockSearchService
+            search_service = MockSearchService()
+
+        embedding_service = EmbeddingService(
+            settings.text_embedding_model,
+            backend=settings.embedding_backend,
+            cache_size=settings.embedding_cache_size,
+            cache_max_bytes=settings.embedding_cache_max_bytes,
+            store_path=settings.embedding_store_path,
+            batch_max_size=settings.embedding_batch_max_size,
+            batch_max_wait_ms=settings.embedding_batch_max_wait_ms,
+            pool_workers=0 if vector_store.cloud_inference else settings.embedding_workers,
+            token_budget=settings.embedding_token_budget
+        )
+
+        rag_service = RAGService(
+            vector_store=vector_store,
+            llm_service=llm_service,
+            search_service=search_service,
+            embedding_service=embedding_service,
+            org_id=settings.org_id
+        )
+        context_evaluator = ContextEvaluator(llm_service)
+        semantic_cache = SemanticCache(
+            vector_store=vector_store,
+            embedding_service=embedding_service,
+            org_id=settings.org_id,
+            similarity_threshold=0.95,
+            ttl_hours=24
+        )
+        agent = AgenticRAG(
+            rag_service=rag_service,
+            context_evaluator=context_evaluator,
+            semantic_cache=semantic_cache
+        )
+
+        print(f"[SERVICES] Built in {int((time.time() - start) * 1000)}ms")
+        return cls(
+            vector_store=vector_store,
+            llm_service=llm_service,
+            search_service=search_service,
+            embedding_service=embedding_service,
+            rag_service=rag_service,
+            context_evaluator=context_evaluator,
+            semantic_cache=semantic_cache,
+            agent=agent
+        )
+
+    async def warmup(self, max_attempts: int = 5, initial_backoff_s: float = 1.0, max_backoff_s: float = 30.0):
+        """Pay every first-use cost before taking traffic, retrying with backoff
+
+        Opens the Qdrant connections (collection registry, cache collection,
+        and the REST client used for cloud inference), loads the embedding model and runs a throwaway encode, starts the
+        embedding worker pool, and pre-opens the LLM connection. The vector
+        store and model are required for readiness; the LLM connection is
+        best-effort since it is re-established on demand.
+
+        A failed attempt is retried with exponential backoff. After
+        `max_attempts` failures `warmup_failed` is set and /health reports
+        unhealthy, so the orchestrator restarts the process.
+        """
+        import asyncio
+        import time
+        start = time.time()
+        delay = initial_backoff_s
+
+        for attempt in range(1, max_attempts + 1):
+            try:
+                await self._warmup_once()
+            except Exception as e:
+                self.warmup_error = str(e)
+                if attempt == max_attempts:
+                    self.warmup_failed = True
+                    print(f"[SERVICES] Warmup failed after {attempt} attempts, giving up: {e}")
+                    return
+                print(f"[SERVICES] Warmup attempt {attempt}/{max_attempts} failed, retrying in {delay:.0f}s: {e}")
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, max_backoff_s)
+                continue
+
+            self.warmup_error = None
+            self.warmup_ms = int((time.time() - start) * 1000)
+            self.ready = True
+            print(f"[SERVICES] Warm and ready in {self.warmup_ms}ms")
+            return
+
+    async def _warmup_once(self):
+        """One warmup attempt, raises the first required step's error"""
+        import asyncio
+
+        async def warm_vector_store():
+            if hasattr(self.vector_store, "refresh_collections"):
+                await self.vector_store.refresh_collections()
+            # Cloud-inference upserts and searches use a separate pooled REST client
+            if self.vector_store.cloud_inference and hasattr(self.vector_store, "open_http_client"):
+                await self.vector_store.open_http_client()
+            await self.semantic_cache.initialize()
+
+        async def warm_embeddings():
+            # Qdrant embeds server-side with cloud inference, no local model needed
+            if self.vector_store.cloud_inference:
+                return
+            loop = asyncio.get_event_loop()
+            await loop.run_in_executor(None, self.embedding_service.warmup)
+            if self.embedding_service.pool is not None:
+                await self.embedding_service.pool.start()
+
+        async def warm_llm():
+            warmup = getattr(self.llm_service, "warmup", None)
+            if warmup is None:
+                return
+            try:
+                await warmup()
+            except Exception as e:
+                print(f"[SERVICES] LLM warmup failed, continuing: {e}")
+
+        # Let every step finish before retrying, so a retry never overlaps a model load
+        results = await asyncio.gather(
+            warm_vector_store(), warm_embeddings(), warm_llm(), return_exceptions=True
+        )
+        for result in results:
+            if isinstance(result, BaseException):
+                raise result
+
+    async def close(self):
+        """Close network clients and the embedding store"""
+        for service in (self.vector_store, self.search_service, self.llm_service):
+            close = getattr(service, "close", None)
+            if close is None:
+                continue
+            try:
+                await close()
+            except Exception as e:
+                print(f"[SERVICES] Error closing {type(service).__name__}: {e}")
+        try:
+            self.embedding_service.close()
+        except Exception as e:
+            print(f"[SERVICES] Error closing EmbeddingService: {e}")
+        await close_http_client()
@@ -1,13 +1,37 @@
 """Main FastAPI application"""
-from fastapi import FastAPI
+from contextlib import asynccontextmanager
+import asyncio
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
 from app.api.routes import auth, kb, query, query_stream
 from app.core.config import settings
+from app.core.services import ServiceContainer
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Build shared services at startup and warm them in the background, close their clients at shutdown
+
+    The process is live (/health) immediately; /ready only succeeds once warmup has finished,
+    and /health fails if warmup gives up after its retries.
+    """
+    app.state.services = await ServiceContainer.create(settings)
+    warmup_task = asyncio.create_task(
+        app.state.services.warmup(max_attempts=settings.warmup_max_attempts)
+    )
+    try:
+        yield
+    finally:
+        warmup_task.cancel()
+        await app.state.services.close()
+
 
 app = FastAPI(
     title="Agentic RAG System",
     description="Multi-tenant RAG system with internet search and RBAC",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
 # CORS middleware
@@ -37,9 +61,36 @@ async def root():
     }
 
 
+@app.get("/stats/embedding-cache")
+async def embedding_cache_stats(request: Request):
+    """Embedding cache hit/miss counters, for sizing EMBEDDING_CACHE_SIZE"""
+    return request.app.state.services.embedding_service.cache_stats()
+
+
+@app.get("/ready")
+async def readiness_check(request: Request):
+    """Readiness probe: 503 until the model is loaded and connections are open"""
+    services = request.app.state.services
+    if services.ready:
+        return {"status": "ready", "warmup_ms": services.warmup_ms}
+    return JSONResponse(
+        status_code=503,
+        content={
+            "status": "failed" if services.warmup_failed else "warming_up",
+            "error": services.warmup_error
+        }
+    )
+
+
 @app.get("/health")
-async def health_check():
-    """Health check endpoint"""
+async def health_check(request: Request):
+    """Health check endpoint, 503 once startup warmup has given up (so the process gets restarted)"""
+    services = request.app.state.services
+    if services.warmup_failed:
+        return JSONResponse(
+            status_code=503,
+            content={"status": "unhealthy", "error": f"Warmup failed: {services.warmup_error}"}
+        )
     return {
         "status": "healthy",
         "environment": settings.environment,
@@ -3,6 +3,7 @@ from typing import Dict, Any, Optional
 from app.services.rag import RAGService
 from app.services.context_evaluator import ContextEvaluator
 from app.services.semantic_cache import SemanticCache
+from app.services.query_context import QueryContext
 from app.core.auth import User
 from datetime import datetime
 import time
@@ -40,10 +41,10 @@ class AgenticRAG:
         
         Decision tree:
         1. Check semantic cache → return if high similarity
-        2. Search local knowledge base
+        2. Search local knowledge base (once)
         3. Evaluate context quality
         4. If insufficient → trigger internet search (if permitted)
-        5. Generate answer
+        5. Generate answer (once, from the routed prompt)
         6. Cache result
         
         Args:
@@ -59,11 +60,13 @@ class AgenticRAG:
         start_time = time.time()
         decision_log = []
         perf = {}  # Performance tracking
+        # Query vector is computed once and shared by the cache and retrieval
+        context = QueryContext(query, self.rag.embedding_service)
         
         # Step 1: Check semantic cache
         decision_log.append("🔍 Checking semantic cache...")
         cache_start = time.time()
-        cached_result = await self.cache.get(query, user.user_id)
+        cached_result = await self.cache.get(query, user.user_id, context=context)
         perf['cache_check_ms'] = int((time.time() - cache_start) * 1000)
         
         if cached_result:
@@ -98,7 +101,7 @@ class AgenticRAG:
         # If user forced a specific mode, use it
         if force_mode and force_mode != "auto":
             decision_log.append(f"👤 User forced mode: {force_mode}")
-            result = await self._execute_mode(force_mode, query, top_k, user, use_mmr, diversity)
+            result = await self._execute_mode(force_mode, query, top_k, user, use_mmr, diversity, context)
             result['decision_log'] = decision_log
             result['agent_decision'] = f"User override: {force_mode}"
             
@@ -110,92 +113,79 @@ class AgenticRAG:
                 result['sources'],
                 result['mode'],
                 user.user_id,
-                {"context_quality": result.get('context_quality')}
+                {"context_quality": result.get('context_quality')},
+                context=context
             )
             perf['cache_store_ms'] = int((time.time() - cache_start) * 1000)
             
             return result
         
-        # Step 2: Search local knowledge base first
+        # Step 2: Retrieve from the local knowledge base (the only vector search)
         decision_log.append("📚 Searching local knowledge base (Qdrant)...")
         filter_classified = not user.permissions.can_access_classified
         
-        local_start = time.time()
-        local_result = await self.rag.query_local(
+        retrieved = await self.rag.retrieve_local(
             query,
             top_k,
             filter_classified,
-            return_timing=True,
             use_mmr=use_mmr,
-            diversity=diversity
+            diversity=diversity,
+            context=context
         )
-        local_total = int((time.time() - local_start) * 1000)
-        
-        # Extract detailed timings
-        if 'timings' in local_result:
-            timings = local_result.pop('timings')
-            perf['embedding_ms'] = timings.get('embedding_ms', 0)
-            perf['qdrant_search_ms'] = timings.get('qdrant_search_ms', 0)
-            perf['llm_generation_ms'] = timings.get('llm_generation_ms', 0)
-        else:
-            perf['qdrant_search_ms'] = local_total
+        perf['embedding_ms'] = context.embedding_ms
+        perf['qdrant_search_ms'] = retrieved['timings'].get('qdrant_search_ms', 0)
         
-        decision_log.append(f"   Found {len(local_result['sources'])} local sources")
-        if 'timings' in perf or perf.get('qdrant_search_ms'):
-            decision_log.append(f"   → Embedding: {perf.get('embedding_ms', 0)}ms | Qdrant: {perf.get('qdrant_search_ms', 0)}ms | LLM: {perf.get('llm_generation_ms', 0)}ms")
+        decision_log.append(f"   Found {len(retrieved['sources'])} local sources")
+        decision_log.append(f"   → Embedding: {perf['embedding_ms']}ms | Qdrant: {perf['qdrant_search_ms']}ms")
         
         # Step 3: Evaluate context quality
         decision_log.append("🔬 Evaluating context quality...")
         eval_start = time.time()
-        quality = await self.evaluator.score_context(query, local_result['sources'])
+        quality = await self.evaluator.score_context(query, retrieved['sources'])
         perf['context_eval_ms'] = int((time.time() - eval_start) * 1000)
         
         decision_log.append(f"   Quality: {quality['overall_score']:.3f} | Sufficient: {quality['is_sufficient']} (took {perf['context_eval_ms']}ms)")
         decision_log.append(f"   {quality['reason']}")
         
-        # Step 4: Intelligent routing decision
-        final_result = None
+        # Step 4: Intelligent routing decision - builds the prompt, nothing generated yet
         agent_decision = ""
         
         if quality['is_sufficient']:
             # Local context is good enough
             decision_log.append("✅ Agent Decision: LOCAL ONLY (context sufficient)")
-            
-            final_result = local_result
-            # LLM time was already captured in local_result timings
+            prepared = await self.rag.prepare_local(query, retrieved=retrieved)
             agent_decision = "local_sufficient"
         
         elif user.permissions.can_search_internet:
             # Context insufficient but user can access internet
+            search_start = time.time()
             if quality['overall_score'] < 0.3:
                 # Very poor local context - use internet only
                 decision_log.append("🌐 Agent Decision: INTERNET ONLY (very limited local data)")
-                
-                search_start = time.time()
-                final_result = await self.rag.query_internet(query, top_k)
-                perf['internet_search_ms'] = int((time.time() - search_start) * 1000)
-                
-                decision_log.append(f"   Internet search completed ({perf['internet_search_ms']}ms)")
+                prepared = await self.rag.prepare_internet(query, top_k)
                 agent_decision = "internet_no_local"
             else:
-                # Some local context - combine with internet
+                # Some local context - combine with internet, reusing the local retrieval
                 decision_log.append("🔀 Agent Decision: HYBRID (enhancing local with internet)")
-                
-                search_start = time.time()
-                final_result = await self.rag.query_hybrid(query, top_k, filter_classified, use_mmr=use_mmr, diversity=diversity)
-                perf['internet_search_ms'] = int((time.time() - search_start) * 1000)
-                
-                decision_log.append(f"   Hybrid search completed ({perf['internet_search_ms']}ms)")
+                prepared = await self.rag.prepare_hybrid(query, top_k, retrieved=retrieved)
                 agent_decision = "hybrid_partial_local"
+            perf['internet_search_ms'] = int((time.time() - search_start) * 1000)
+            decision_log.append(f"   Internet search completed ({perf['internet_search_ms']}ms)")
         
         else:
-            # User cannot access internet - return local even if insufficient
+            # User cannot access internet - answer from local even if insufficient
             decision_log.append("⚠️  Agent Decision: LOCAL (insufficient but no internet permission)")
-            final_result = local_result
-            perf['llm_generation_ms'] = 0
+            prepared = await self.rag.prepare_local(query, retrieved=retrieved)
             agent_decision = "local_no_permission"
         
-        # Step 5: Add metadata
+        # Step 5: Generate the answer (the only answer LLM call)
+        decision_log.append("🤖 Generating answer...")
+        llm_start = time.time()
+        final_result = await self.rag.generate(prepared)
+        perf['llm_generation_ms'] = int((time.time() - llm_start) * 1000)
+        decision_log.append(f"   LLM: {perf['llm_generation_ms']}ms")
+        
+        # Step 6: Add metadata
         total_time = int((time.time() - start_time) * 1000)
         
         final_result['context_quality'] = quality
@@ -211,7 +201,7 @@ class AgenticRAG:
         perf['total_ms'] = total_time
         final_result['performance_breakdown'] = perf
         
-        # Step 6: Cache the result
+        # Step 7: Cache the result
         decision_log.append("💾 Caching result for future queries...")
         cache_start = time.time()
         await self.cache.set(
@@ -223,7 +213,8 @@ class AgenticRAG:
             {
                 "context_quality": quality,
                 "agent_decision": agent_decision
-            }
+            },
+            context=context
         )
         perf['cache_store_ms'] = int((time.time() - cache_start) * 1000)
         
@@ -238,17 +229,22 @@ class AgenticRAG:
         top_k: int,
         user: User,
         use_mmr: bool = False,
-        diversity: float = 0.5
+        diversity: float = 0.5,
+        context: Optional[QueryContext] = None
     ) -> Dict[str, Any]:
         """Execute a specific mode"""
         filter_classified = not user.permissions.can_access_classified
         
         if mode == "local":
-            return await self.rag.query_local(query, top_k, filter_classified, use_mmr=use_mmr, diversity=diversity)
+            return await self.rag.query_local(
+                query, top_k, filter_classified, use_mmr=use_mmr, diversity=diversity, context=context
+            )
         elif mode == "internet":
             return await self.rag.query_internet(query, top_k)
         elif mode == "hybrid":
-            return await self.rag.query_hybrid(query, top_k, filter_classified, use_mmr=use_mmr, diversity=diversity)
+            return await self.rag.query_hybrid(
+                query, top_k, filter_classified, use_mmr=use_mmr, diversity=diversity, context=context
+            )
         else:
             raise ValueError(f"Unknown mode: {mode}")
 
@@ -115,40 +115,380 @@ class DocumentProcessor:
         return images
 
 
+class EmbeddingCache:
+    """Thread-safe LRU of float32 embeddings, bounded by entry count and/or bytes"""
+    
+    def __init__(self, max_entries: int = 10000, max_bytes: Optional[int] = None):
+        import threading
+        from collections import OrderedDict
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+    
+    @staticmethod
+    def key(model_name: str, text: str) -> str:
+        """Hash of model name and whitespace-normalized text"""
+        import hashlib
+        normalized = " ".join(text.split())
+        return hashlib.sha256(f"{model_name}\0{normalized}".encode("utf-8")).hexdigest()
+    
+    def get(self, key: str):
+        with self._lock:
+            vector = self._entries.get(key)
+            if vector is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return vector
+    
+    def put(self, key: str, vector):
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                return
+            self._entries[key] = vector
+            self.bytes += vector.nbytes
+            while self._entries and (
+                len(self._entries) > self.max_entries
+                or (self.max_bytes is not None and self.bytes > self.max_bytes)
+            ):
+                _, evicted = self._entries.popitem(last=False)
+                self.bytes -= evicted.nbytes
+    
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "bytes": self.bytes,
+                "max_entries": self.max_entries,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0
+            }
+
+
+class EmbeddingStore:
+    """Content-addressed on-disk embeddings (SQLite, float32 blobs)
+
+    Keys are `EmbeddingCache.key` hashes of model name and text, so unchanged
+    chunks are found again on ingestion reruns and a model change never
+    returns stale vectors.
+    """
+    
+    # Stay below SQLite's bound-parameter limit
+    _BATCH = 500
+    
+    def __init__(self, path: str):
+        import sqlite3
+        import threading
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self.path = path
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS embeddings (key TEXT PRIMARY KEY, vector BLOB NOT NULL)"
+        )
+        self._conn.commit()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+    
+    def get_many(self, keys: List[str]) -> Dict[str, Any]:
+        """Stored vectors for the keys that are present"""
+        import numpy as np
+        found = {}
+        with self._lock:
+            for i in range(0, len(keys), self._BATCH):
+                batch = keys[i:i + self._BATCH]
+                rows = self._conn.execute(
+                    f"SELECT key, vector FROM embeddings WHERE key IN ({','.join('?' * len(batch))})",
+                    batch
+                ).fetchall()
+                for key, blob in rows:
+                    found[key] = np.frombuffer(blob, dtype=np.float32)
+            self.hits += len(found)
+            self.misses += len(set(keys)) - len(found)
+        return found
+    
+    def put_many(self, items: List[Any]):
+        """Store (key, float32 vector) pairs"""
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO embeddings (key, vector) VALUES (?, ?)",
+                [(key, vector.tobytes()) for key, vector in items]
+            )
+            self._conn.commit()
+    
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            (entries,) = self._conn.execute("SELECT COUNT(*) FROM embeddings").fetchone()
+            return {"path": self.path, "entries": entries, "hits": self.hits, "misses": self.misses}
+    
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
 class EmbeddingService:
-    """Generate embeddings for text"""
+    """Generate embeddings for text
+
+    backend: "torch" (SentenceTransformer), "onnx" (ONNX Runtime, fp32) or
+    "onnx-int8" (ONNX Runtime, dynamically quantized weights)
+    """
+    
+    BACKENDS = ("torch", "onnx", "onnx-int8")
+    # Upper bound on texts per bulk-embed bucket, however short they are
+    MAX_BUCKET_SIZE = 256
     
     def __init__(
         self,
-        text_model_name: str = "all-MiniLM-L6-v2"
+        text_model_name: str = "all-MiniLM-L6-v2",
+        backend: str = "torch",
+        cache_size: int = 10000,
+        cache_max_bytes: Optional[int] = None,
+        store_path: Optional[str] = None,
+        batch_max_size: int = 0,
+        batch_max_wait_ms: float = 5.0,
+        pool_workers: int = 0,
+        token_budget: int = 8192
     ):
+        if backend not in self.BACKENDS:
+            raise ValueError(f"Unknown embedding backend: {backend}")
         self.text_model_name = text_model_name
+        self.backend = backend
+        # Cache keys include the backend so approximate (int8) vectors never mix with exact ones
+        self.cache_model_id = text_model_name if backend == "torch" else f"{text_model_name}@{backend}"
         self._text_model = None
+        # Padded tokens per forward pass for embed_bulk
+        self.token_budget = token_budget
+        # In-memory LRU of recent embeddings (cache_size=0 disables it)
+        self.cache = EmbeddingCache(cache_size, cache_max_bytes) if cache_size > 0 else None
+        # Persistent store checked after the LRU, so reruns only encode changed chunks
+        self.store = EmbeddingStore(store_path) if store_path else None
+        # Micro-batching for concurrent async query embeds (batch_max_size=0 disables it)
+        self.batcher = None
+        if batch_max_size > 0:
+            from app.services.embedding_batcher import EmbeddingBatcher
+            self.batcher = EmbeddingBatcher(self.embed_array, batch_max_size, batch_max_wait_ms)
+        # Worker processes for bulk ingestion (pool_workers=0 encodes in-process)
+        self.pool = None
+        if pool_workers > 0:
+            from app.services.embedding_pool import EmbeddingProcessPool
+            self.pool = EmbeddingProcessPool(
+                text_model_name,
+                backend=backend,
+                workers=pool_workers,
+                token_budget=token_budget
+            )
     
     def _load_text_model(self):
         """Lazy load text embedding model"""
         if self._text_model is None:
             import time
             load_start = time.time()
-            from sentence_transformers import SentenceTransformer
-            print(f"[EMBEDDING] Loading SentenceTransformer model: {self.text_model_name}")
-            self._text_model = SentenceTransformer(self.text_model_name)
+            if self.backend == "torch":
+                from sentence_transformers import SentenceTransformer
+                print(f"[EMBEDDING] Loading SentenceTransformer model: {self.text_model_name}")
+                self._text_model = SentenceTransformer(self.text_model_name)
+            else:
+                from app.services.onnx_embedding import OnnxEmbeddingModel
+                print(f"[EMBEDDING] Loading ONNX Runtime model: {self.text_model_name} ({self.backend})")
+                self._text_model = OnnxEmbeddingModel(
+                    self.text_model_name,
+                    quantize=self.backend == "onnx-int8"
+                )
             load_time = int((time.time() - load_start) * 1000)
             print(f"[EMBEDDING] Model loaded in: {load_time}ms")
         return self._text_model
     
+    def warmup(self):
+        """Load the model and run one throwaway encode (kernel selection, buffer allocation)"""
+        import time
+        warmup_start = time.time()
+        self._load_text_model()
+        self._encode(["warmup"])  # Bypasses the caches on purpose
+        print(f"[EMBEDDING] Warmed up in: {int((time.time() - warmup_start) * 1000)}ms")
+    
+    def embed_array(self, texts: List[str]):
+        """float32 embeddings, shape (len(texts), dim), encoding only the ones in neither cache
+        
+        The array goes straight to `upsert_vectors` without building a Python
+        float per component. For large batches prefer `embed_bulk`.
+        """
+        return self._embed(texts, self._encode)
+    
+    def embed_bulk(self, texts: List[str], token_budget: Optional[int] = None):
+        """`embed_array` for large batches, encoded in length-sorted buckets
+        
+        Texts are sorted by token count and grouped so that each forward pass
+        pads to at most `token_budget` tokens (longest text x bucket size),
+        instead of padding fixed-size batches of mixed lengths to their
+        longest member. Rows come back in input order.
+        """
+        token_budget = token_budget or self.token_budget
+        return self._embed(texts, lambda batch: self._encode_bucketed(batch, token_budget))
+    
+    def _embed(self, texts: List[str], encode):
+        """Cache/store lookups around `encode`, which only sees the misses"""
+        if self.cache is None and self.store is None:
+            return encode(texts)
+        
+        keys, vectors, missing = self._lookup(texts)
+        if missing:
+            self._fill(keys, vectors, missing, encode([texts[i] for i in missing]))
+        return self._finish(texts, vectors, missing)
+    
     def embed_text(self, texts: List[str]) -> List[List[float]]:
-        """Generate embeddings for text"""
+        """Generate embeddings for text as nested lists (JSON-ready)"""
+        return self.embed_array(texts).tolist()
+    
+    async def embed_array_async(self, texts: List[str]):
+        """`embed_bulk` without blocking the event loop
+        
+        Encodes in the process pool when one is configured, otherwise in the
+        default thread executor.
+        """
+        import asyncio
+        loop = asyncio.get_event_loop()
+        if self.pool is None:
+            return await loop.run_in_executor(None, self.embed_bulk, texts)
+        
+        if self.cache is None and self.store is None:
+            return await self.pool.encode(texts)
+        
+        # Hashing and SQLite reads/writes stay off the loop too, only encoding goes to the pool
+        keys, vectors, missing = await loop.run_in_executor(None, self._lookup, texts)
+        if missing:
+            encoded = await self.pool.encode([texts[i] for i in missing])
+            await loop.run_in_executor(None, self._fill, keys, vectors, missing, encoded)
+        return await loop.run_in_executor(None, self._finish, texts, vectors, missing)
+    
+    def _lookup(self, texts: List[str]):
+        """Cache keys, vectors found in the LRU or store (None otherwise) and indexes still missing"""
+        keys = [EmbeddingCache.key(self.cache_model_id, text) for text in texts]
+        vectors = [self.cache.get(key) if self.cache is not None else None for key in keys]
+        missing = [i for i, vector in enumerate(vectors) if vector is None]
+        
+        if missing and self.store is not None:
+            stored = self.store.get_many([keys[i] for i in missing])
+            for i in missing:
+                vector = stored.get(keys[i])
+                if vector is not None:
+                    vectors[i] = vector
+                    if self.cache is not None:
+                        self.cache.put(keys[i], vector)
+            missing = [i for i in missing if vectors[i] is None]
+        return keys, vectors, missing
+    
+    def _fill(self, keys: List[str], vectors: List[Any], missing: List[int], encoded):
+        """Put freshly encoded vectors in place and in both caches"""
+        for i, vector in zip(missing, encoded):
+            # Own copy: a row view would pin the whole batch array in the LRU
+            vector = vector.copy()
+            vectors[i] = vector
+            if self.cache is not None:
+                self.cache.put(keys[i], vector)
+        if self.store is not None:
+            self.store.put_many([(keys[i], vectors[i]) for i in missing])
+    
+    def _finish(self, texts: List[str], vectors: List[Any], missing: List[int]):
+        import numpy as np
+        if len(missing) < len(texts):
+            print(f"[EMBEDDING] Reused {len(texts) - len(missing)}/{len(texts)} cached embedding(s)")
+        return np.stack(vectors) if vectors else np.zeros((0, 0), dtype=np.float32)
+    
+    def _encode(self, texts: List[str]):
+        """Run the model, returns a float32 array"""
         import time
+        import numpy as np
         model = self._load_text_model()
         encode_start = time.time()
         embeddings = model.encode(texts, convert_to_numpy=True)
         encode_time = int((time.time() - encode_start) * 1000)
         print(f"[EMBEDDING] Encoding {len(texts)} text(s) took: {encode_time}ms")
-        return embeddings.tolist()
+        return np.asarray(embeddings, dtype=np.float32)
+    
+    def _encode_bucketed(self, texts: List[str], token_budget: int):
+        """Run the model on length-sorted buckets of at most token_budget padded tokens"""
+        import time
+        import numpy as np
+        if not texts:
+            return np.zeros((0, 0), dtype=np.float32)
+        
+        model = self._load_text_model()
+        encode_start = time.time()
+        lengths = self._token_lengths(texts)
+        
+        buckets = [[]]
+        for i in np.argsort(lengths, kind="stable").tolist():
+            bucket = buckets[-1]
+            # Ascending order, so text i is the longest in its bucket and sets the padding
+            if bucket and (lengths[i] * (len(bucket) + 1) > token_budget or len(bucket) >= self.MAX_BUCKET_SIZE):
+                bucket = []
+                buckets.append(bucket)
+            bucket.append(i)
+        
+        result = None
+        for bucket in buckets:
+            vectors = model.encode([texts[i] for i in bucket], batch_size=len(bucket), convert_to_numpy=True)
+            vectors = np.asarray(vectors, dtype=np.float32)
+            if result is None:
+                result = np.empty((len(texts), vectors.shape[1]), dtype=np.float32)
+            result[bucket] = vectors
+        
+        encode_time = int((time.time() - encode_start) * 1000)
+        print(f"[EMBEDDING] Encoding {len(texts)} text(s) in {len(buckets)} length bucket(s) took: {encode_time}ms")
+        return result
+    
+    def _token_lengths(self, texts: List[str]) -> List[int]:
+        """Token count per text as the model will see it (truncated to its max length)"""
+        model = self._load_text_model()
+        if hasattr(model, "token_lengths"):
+            return model.token_lengths(texts)
+        tokenizer = getattr(model, "tokenizer", None)
+        if tokenizer is None:
+            return [len(text.split()) for text in texts]
+        max_length = getattr(model, "max_seq_length", None) or 512
+        input_ids = tokenizer(texts, truncation=True, max_length=max_length)["input_ids"]
+        return [len(ids) for ids in input_ids]
+    
+    def cache_stats(self) -> Dict[str, Any]:
+        """Hit/miss counters and size of the embedding caches"""
+        stats = {"enabled": False} if self.cache is None else {"enabled": True, **self.cache.stats()}
+        if self.store is not None:
+            stats["store"] = self.store.stats()
+        if self.batcher is not None:
+            stats["batcher"] = self.batcher.stats()
+        if self.pool is not None:
+            stats["pool"] = self.pool.stats()
+        return stats
+    
+    def close(self):
+        """Stop the batcher and worker pool and close the persistent store"""
+        if self.batcher is not None:
+            self.batcher.close()
+        if self.pool is not None:
+            self.pool.close()
+        if self.store is not None:
+            self.store.close()
     
     def embed_text_query(self, query: str) -> List[float]:
         """Generate embedding for a single query"""
         return self.embed_text([query])[0]
-
-
+    
+    async def embed_text_query_async(self, query: str):
+        """float32 query vector computed off the event loop, batched with concurrent callers when enabled"""
+        if self.batcher is not None:
+            return await self.batcher.embed(query)
+        import asyncio
+        loop = asyncio.get_event_loop()
+        vectors = await loop.run_in_executor(None, self.embed_array, [query])
+        return vectors[0]
@@ -0,0 +1,83 @@
+"""Dynamic micro-batching for concurrent query embeddings"""
+from typing import Optional
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
+
+class EmbeddingBatcher:
+    """Coalesces concurrent single-text embeds into one model call
+
+    Callers await `embed(text)`. A worker task takes the first pending text,
+    waits at most `max_wait_ms` for more (or until `max_batch_size`), runs one
+    `embed_array` batch on a dedicated thread and resolves every caller's
+    future. Texts that arrive while a batch is encoding form the next one, so
+    the model never runs several batch-size-1 encodes in parallel. Added
+    latency is bounded by `max_wait_ms` plus the batch encode time.
+    """
+
+    def __init__(self, embed_batch, max_batch_size: int = 32, max_wait_ms: float = 5.0):
+        self.embed_batch = embed_batch
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000
+        # One encode at a time: parallel encodes only contend for the GIL and BLAS threads
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="embed-batch")
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker: Optional[asyncio.Task] = None
+        self.batches = 0
+        self.items = 0
+
+    async def embed(self, text: str):
+        """float32 embedding for one text, encoded together with concurrent callers"""
+        loop = asyncio.get_running_loop()
+        if self._worker is None or self._worker.done():
+            self._queue = asyncio.Queue()
+            self._worker = loop.create_task(self._run())
+        future = loop.create_future()
+        await self._queue.put((text, future))
+        return await future
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._queue.get()]
+            deadline = loop.time() + self.max_wait
+            while len(batch) < self.max_batch_size:
+                if not self._queue.empty():
+                    batch.append(self._queue.get_nowait())
+                    continue
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+
+            texts = [text for text, _ in batch]
+            try:
+                vectors = await loop.run_in_executor(self._executor, self.embed_batch, texts)
+            except Exception as e:
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+
+            self.batches += 1
+            self.items += len(batch)
+            for (_, future), vector in zip(batch, vectors):
+                if not future.done():  # Caller may have been cancelled
+                    future.set_result(vector)
+
+    def stats(self):
+        return {
+            "batches": self.batches,
+            "items": self.items,
+            "mean_batch_size": self.items / self.batches if self.batches else 0.0
+        }
+
+    def close(self):
+        """Stop the worker task and its thread"""
+        if self._worker is not None:
+            self._worker.cancel()
+            self._worker = None
+        self._executor.shutdown(wait=False)
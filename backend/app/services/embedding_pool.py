@@ -0,0 +1,155 @@
+"""Out-of-process embedding workers for bulk ingestion"""
+from typing import List, Optional
+import numpy as np
+
+
+# Per-worker model, loaded once by the pool initializer
+_worker_service = None
+_worker_token_budget = 8192
+
+
+def _init_worker(model_name: str, backend: str, num_threads: Optional[int], token_budget: int):
+    """Load the model once per worker process"""
+    global _worker_service, _worker_token_budget
+    _worker_token_budget = token_budget
+    if num_threads:
+        import os
+        for var in ("OMP_NUM_THREADS", "MKL_NUM_THREADS", "OPENBLAS_NUM_THREADS"):
+            os.environ[var] = str(num_threads)
+        try:
+            import torch
+            torch.set_num_threads(num_threads)
+        except ImportError:
+            pass
+    from app.services.document_processor import EmbeddingService
+    # No cache/store in workers: the parent checks those before dispatching
+    _worker_service = EmbeddingService(model_name, backend=backend, cache_size=0)
+    _worker_service._load_text_model()
+
+
+def _encode_to_shared_memory(texts: List[str]):
+    """Encode in the worker, hand the vectors back through a shared memory block
+
+    Returns (block name, shape); the parent copies the array out and unlinks
+    the block, so only the name crosses the process boundary.
+    """
+    from multiprocessing import shared_memory
+    vectors = _worker_service._encode_bucketed(texts, _worker_token_budget)
+    block = shared_memory.SharedMemory(create=True, size=max(vectors.nbytes, 1))
+    np.ndarray(vectors.shape, dtype=np.float32, buffer=block.buf)[:] = vectors
+    name = block.name
+    block.close()
+    return name, vectors.shape
+
+
+def _unlink_result(future):
+    """Done callback that frees the shared memory block of an abandoned chunk"""
+    from multiprocessing import shared_memory
+    if future.cancelled() or future.exception() is not None:
+        return
+    name, _ = future.result()
+    try:
+        block = shared_memory.SharedMemory(name=name)
+    except FileNotFoundError:
+        return
+    block.close()
+    block.unlink()
+
+
+def _warmup():
+    return True
+
+
+class EmbeddingProcessPool:
+    """Process pool that embeds text batches outside the API process
+
+    Encoding in the server process holds the GIL for the whole batch, so a
+    large upload stalls every request on that worker. Here each pool process
+    loads the model once; batches are split into chunks spread across the
+    processes and the resulting vectors come back via shared memory instead
+    of being pickled.
+    """
+
+    def __init__(
+        self,
+        text_model_name: str,
+        backend: str = "torch",
+        workers: int = 2,
+        chunk_size: int = 128,
+        threads_per_worker: Optional[int] = None,
+        token_budget: int = 8192
+    ):
+        import multiprocessing
+        from concurrent.futures import ProcessPoolExecutor
+        self.workers = workers
+        self.chunk_size = chunk_size
+        # spawn: forking a process that already holds torch/BLAS threads can deadlock
+        self._executor = ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker,
+            initargs=(text_model_name, backend, threads_per_worker, token_budget)
+        )
+        self.batches = 0
+        self.texts = 0
+
+    async def start(self):
+        """Start every worker and load its model"""
+        import asyncio
+        import time
+        start = time.time()
+        loop = asyncio.get_event_loop()
+        await asyncio.gather(*[
+            loop.run_in_executor(self._executor, _warmup) for _ in range(self.workers)
+        ])
+        print(f"[EMBEDDING] Process pool ready ({self.workers} workers) in {int((time.time() - start) * 1000)}ms")
+
+    async def encode(self, texts: List[str]) -> np.ndarray:
+        """float32 embeddings for texts, encoded in parallel across workers"""
+        import asyncio
+        from multiprocessing import shared_memory
+
+        if not texts:
+            return np.zeros((0, 0), dtype=np.float32)
+
+        # Enough chunks to keep every worker busy, bounded for memory per task
+        size = min(self.chunk_size, -(-len(texts) // self.workers))
+        chunks = [texts[i:i + size] for i in range(0, len(texts), size)]
+
+        futures = [self._executor.submit(_encode_to_shared_memory, chunk) for chunk in chunks]
+        try:
+            results = await asyncio.gather(
+                *[asyncio.wrap_future(future) for future in futures], return_exceptions=True
+            )
+        except asyncio.CancelledError:
+            # Chunks already running finish anyway: unlink their blocks when they do
+            for future in futures:
+                future.add_done_callback(_unlink_result)
+            raise
+
+        # Copy out and unlink every block that was created before raising any failure
+        parts = []
+        error = None
+        for result in results:
+            if isinstance(result, BaseException):
+                error = error or result
+                continue
+            name, shape = result
+            block = shared_memory.SharedMemory(name=name)
+            try:
+                parts.append(np.ndarray(shape, dtype=np.float32, buffer=block.buf).copy())
+            finally:
+                block.close()
+                block.unlink()
+        if error is not None:
+            raise error
+
+        self.batches += 1
+        self.texts += len(texts)
+        return np.concatenate(parts)
+
+    def stats(self):
+        return {"workers": self.workers, "batches": self.batches, "texts": self.texts}
+
+    def close(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
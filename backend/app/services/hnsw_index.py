@@ -0,0 +1,238 @@
+"""HNSW graph index for the local vector store"""
+from typing import Callable, Dict, List, Optional, Tuple
+from pathlib import Path
+import heapq
+import math
+import os
+import numpy as np
+
+
+class HNSWIndex:
+    """Hierarchical Navigable Small World graph over normalized vectors
+
+    Nodes are the row numbers of a `LocalVectorStore` collection, inserted in
+    order as rows are appended. Vectors are not copied: the index reads them
+    through `get_vectors(rows)`, so memory-mapped segments stay on disk.
+    Deleted rows remain in the graph as tombstones that are traversed but
+    never returned; callers pass an `allowed` mask to exclude them.
+
+    Knobs follow Qdrant's HNSW config: `m` edges per node (2*m on layer 0),
+    `ef_construct` beam width while inserting and `ef_search` at query time.
+    """
+
+    name = "hnsw"
+
+    def __init__(
+        self,
+        get_vectors: Callable[[np.ndarray], np.ndarray],
+        m: int = 16,
+        ef_construct: int = 100,
+        ef_search: int = 64,
+        seed: int = 42
+    ):
+        self.get_vectors = get_vectors
+        self.m = m
+        self.ef_construct = ef_construct
+        self.ef_search = ef_search
+        self.level_mult = 1.0 / math.log(max(m, 2))
+        self.rng = np.random.default_rng(seed)
+
+        self.levels: List[int] = []
+        # layers[0] holds every node, upper layers only the nodes promoted to them
+        self.layers: List[Dict[int, List[int]]] = [{}]
+        self.entry_point: Optional[int] = None
+
+    @property
+    def count(self) -> int:
+        return len(self.levels)
+
+    @property
+    def ready(self) -> bool:
+        return True
+
+    def _max_edges(self, layer: int) -> int:
+        return self.m * 2 if layer == 0 else self.m
+
+    def _similarities(self, query: np.ndarray, nodes: List[int]) -> List[float]:
+        return (self.get_vectors(np.asarray(nodes)) @ query).tolist()
+
+    def _search_layer(
+        self,
+        query: np.ndarray,
+        entry_points: List[Tuple[float, int]],
+        ef: int,
+        layer: int
+    ) -> List[Tuple[float, int]]:
+        """Beam search on one layer, returns up to `ef` (similarity, node) pairs"""
+        adjacency = self.layers[layer]
+        visited = {node for _, node in entry_points}
+        candidates = [(-sim, node) for sim, node in entry_points]
+        heapq.heapify(candidates)
+        results = list(entry_points)
+        heapq.heapify(results)
+        while len(results) > ef:
+            heapq.heappop(results)
+
+        while candidates:
+            neg_sim, node = heapq.heappop(candidates)
+            if len(results) >= ef and -neg_sim < results[0][0]:
+                break
+
+            neighbors = [n for n in adjacency.get(node, ()) if n not in visited]
+            if not neighbors:
+                continue
+            visited.update(neighbors)
+
+            for sim, neighbor in zip(self._similarities(query, neighbors), neighbors):
+                if len(results) < ef or sim > results[0][0]:
+                    heapq.heappush(candidates, (-sim, neighbor))
+                    heapq.heappush(results, (sim, neighbor))
+                    if len(results) > ef:
+                        heapq.heappop(results)
+
+        return results
+
+    def _select_neighbors(self, candidates: List[Tuple[float, int]], limit: int) -> List[int]:
+        """Diversity heuristic: keep a candidate only if it is closer to the base than to any kept one"""
+        ordered = sorted(candidates, reverse=True)
+        if len(ordered) <= limit:
+            return [node for _, node in ordered]
+
+        nodes = [node for _, node in ordered]
+        vectors = self.get_vectors(np.asarray(nodes))
+        pairwise = vectors @ vectors.T
+
+        selected: List[int] = []
+        skipped: List[int] = []
+        for i, (sim, _) in enumerate(ordered):
+            if all(pairwise[i, j] < sim for j in selected):
+                selected.append(i)
+                if len(selected) == limit:
+                    break
+            else:
+                skipped.append(i)
+
+        # Fill up with the closest discarded candidates to keep the graph well connected
+        for i in skipped:
+            if len(selected) == limit:
+                break
+            selected.append(i)
+
+        return [nodes[i] for i in selected]
+
+    def add(self, start: int, vectors: np.ndarray):
+        """Insert rows `start .. start + len(vectors)` (vectors already normalized)"""
+        if start != self.count:
+            raise ValueError(f"HNSW index expects row {self.count}, got {start}")
+
+        for offset, vector in enumerate(vectors):
+            self._insert(start + offset, vector)
+
+    def _insert(self, node: int, vector: np.ndarray):
+        level = int(-math.log(1.0 - self.rng.random()) * self.level_mult)
+        self.levels.append(level)
+        while len(self.layers) <= level:
+            self.layers.append({})
+        for layer in range(level + 1):
+            self.layers[layer][node] = []
+
+        if self.entry_point is None:
+            self.entry_point = node
+            return
+
+        entry = self.entry_point
+        top = self.levels[entry]
+        nearest = [(self._similarities(vector, [entry])[0], entry)]
+
+        # Greedy descent through layers above the new node's level
+        for layer in range(top, level, -1):
+            nearest = [max(self._search_layer(vector, nearest, 1, layer))]
+
+        for layer in range(min(level, top), -1, -1):
+            nearest = self._search_layer(vector, nearest, self.ef_construct, layer)
+            limit = self._max_edges(layer)
+            neighbors = self._select_neighbors(nearest, self.m)
+            self.layers[layer][node] = neighbors
+
+            for neighbor in neighbors:
+                edges = self.layers[layer][neighbor]
+                edges.append(node)
+                if len(edges) > limit:
+                    base = self.get_vectors(np.asarray([neighbor]))[0]
+                    scored = list(zip(self._similarities(base, edges), edges))
+                    self.layers[layer][neighbor] = self._select_neighbors(scored, limit)
+
+        if level > top:
+            self.entry_point = node
+
+    def search(
+        self,
+        query: np.ndarray,
+        top_k: int,
+        allowed: Optional[np.ndarray] = None,
+        ef: Optional[int] = None
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Approximate top-k (rows, similarities) among rows where `allowed` is true"""
+        if self.entry_point is None or top_k <= 0:
+            return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.float32)
+
+        entry = self.entry_point
+        nearest = [(self._similarities(query, [entry])[0], entry)]
+        for layer in range(self.levels[entry], 0, -1):
+            nearest = [max(self._search_layer(query, nearest, 1, layer))]
+
+        # Widen the beam until enough allowed rows surface (tombstones and filters eat into it)
+        ef = max(ef or self.ef_search, top_k)
+        while True:
+            found = sorted(self._search_layer(query, nearest, ef, 0), reverse=True)
+            if allowed is not None:
+                found = [(sim, node) for sim, node in found if allowed[node]]
+            if len(found) >= top_k or ef >= self.count:
+                break
+            ef *= 2
+
+        found = found[:top_k]
+        rows = np.array([node for _, node in found], dtype=np.int64)
+        sims = np.array([sim for sim, _ in found], dtype=np.float32)
+        return rows, sims
+
+    def save(self, path: Path):
+        """Snapshot the graph so a restart only inserts rows added since"""
+        arrays = {
+            "levels": np.asarray(self.levels, dtype=np.int32),
+            "entry_point": np.asarray([-1 if self.entry_point is None else self.entry_point]),
+            "params": np.asarray([self.m, self.ef_construct]),
+        }
+        for layer, adjacency in enumerate(self.layers):
+            nodes = sorted(adjacency)
+            arrays[f"nodes_{layer}"] = np.asarray(nodes, dtype=np.int64)
+            arrays[f"indptr_{layer}"] = np.cumsum([0] + [len(adjacency[n]) for n in nodes])
+            arrays[f"edges_{layer}"] = np.asarray(
+                [e for n in nodes for e in adjacency[n]], dtype=np.int64
+            )
+
+        tmp_path = path.with_suffix(".tmp")
+        with open(tmp_path, "wb") as f:
+            np.savez(f, **arrays)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+
+    def load(self, path: Path) -> bool:
+        """Restore a snapshot written with the same parameters, returns False otherwise"""
+        data = np.load(path)
+        if data["params"].tolist() != [self.m, self.ef_construct]:
+            return False
+
+        self.levels = data["levels"].tolist()
+        entry_point = int(data["entry_point"][0])
+        self.entry_point = None if entry_point < 0 else entry_point
+        self.layers = []
+        layer = 0
+        while f"nodes_{layer}" in data:
+            nodes = data[f"nodes_{layer}"].tolist()
+            indptr = data[f"indptr_{layer}"].tolist()
+            edges = data[f"edges_{layer}"].tolist()
+            self.layers.append({n: edges[indptr[i]:indptr[i + 1]] for i, n in enumerate(nodes)})
+            layer += 1
+        return True
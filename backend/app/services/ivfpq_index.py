@@ -0,0 +1,254 @@
+"""IVF-PQ compressed index for the local vector store"""
+from typing import Callable, List, Optional, Tuple
+from pathlib import Path
+import os
+import numpy as np
+
+
+def _kmeans(data: np.ndarray, k: int, iterations: int, rng: np.random.Generator, spherical: bool = False) -> np.ndarray:
+    """Lloyd's k-means, spherical (cosine) for the coarse quantizer, L2 for PQ subspaces"""
+    centroids = data[rng.choice(len(data), size=k, replace=len(data) < k)].copy()
+    for _ in range(iterations):
+        assign = _assign(data, centroids, spherical)
+        sums = np.zeros_like(centroids)
+        np.add.at(sums, assign, data)
+        counts = np.bincount(assign, minlength=k)
+        empty = counts == 0
+        centroids[~empty] = sums[~empty] / counts[~empty, None]
+        # Re-seed empty clusters with random points so every code stays usable
+        if empty.any():
+            centroids[empty] = data[rng.choice(len(data), size=int(empty.sum()))]
+        if spherical:
+            norms = np.linalg.norm(centroids, axis=1, keepdims=True)
+            centroids /= np.where(norms == 0, 1.0, norms)
+    return centroids
+
+
+def _assign(data: np.ndarray, centroids: np.ndarray, spherical: bool = False, chunk: int = 65536) -> np.ndarray:
+    """Nearest centroid per row, in chunks to bound the distance matrix"""
+    out = np.empty(len(data), dtype=np.int64)
+    half_norms = 0.0 if spherical else 0.5 * (centroids ** 2).sum(axis=1)
+    for i in range(0, len(data), chunk):
+        # argmin ||x - c||^2 == argmax (x.c - ||c||^2 / 2); spherical drops the norm term
+        out[i:i + chunk] = np.argmax(data[i:i + chunk] @ centroids.T - half_norms, axis=1)
+    return out
+
+
+class IVFPQIndex:
+    """Inverted file index with product-quantized residuals
+
+    Rows are assigned to one of `nlist` coarse centroids and their residual is
+    split into `pq_m` sub-vectors, each stored as a one-byte code. A 384-dim
+    float32 vector (1536 bytes) becomes `pq_m` bytes plus a 4-byte row number,
+    e.g. 52 bytes (~30x smaller) with the default `pq_m=48`.
+
+    Search probes the `nprobe` closest lists and scores their codes with
+    asymmetric distance computation: the query stays uncompressed and one
+    lookup table per query turns every code into a sum of `pq_m` table reads.
+    The best `rerank` candidates are re-scored exactly against the original
+    vectors, read through `get_vectors` so they can stay memory-mapped.
+
+    Codebooks are trained once the collection reaches `min_train` rows, in
+    the store's background indexing thread; until then `ready` is false and
+    the store scans exactly. The savings need a persistent store: in memory,
+    the original vectors stay resident next to the codes.
+    """
+
+    name = "ivfpq"
+
+    def __init__(
+        self,
+        get_vectors: Callable[[np.ndarray], np.ndarray],
+        nlist: int = 256,
+        pq_m: int = 48,
+        nprobe: int = 16,
+        rerank: int = 100,
+        min_train: Optional[int] = None,
+        seed: int = 42
+    ):
+        self.get_vectors = get_vectors
+        self.params = [nlist, pq_m]
+        self.nlist = nlist
+        self.pq_m = pq_m
+        self.nprobe = nprobe
+        self.rerank = rerank
+        self.min_train = min_train or max(nlist * 8, 4096)
+        self.rng = np.random.default_rng(seed)
+
+        self.count = 0
+        self.centroids: Optional[np.ndarray] = None  # (nlist, d)
+        self.codebooks: Optional[np.ndarray] = None  # (pq_m, 256, d / pq_m)
+        self.list_rows: List[np.ndarray] = []
+        self.list_codes: List[np.ndarray] = []
+        self.list_sizes = np.zeros(nlist, dtype=np.int64)
+
+    @property
+    def ready(self) -> bool:
+        return self.centroids is not None
+
+    def memory_bytes(self) -> int:
+        """Bytes held for codes and row numbers (excludes the fixed-size codebooks)"""
+        return int(self.list_sizes.sum()) * (self.pq_m + 4)
+
+    def add(self, start: int, vectors: np.ndarray):
+        """Register rows `start .. start + len(vectors)` (vectors already normalized)"""
+        if start != self.count:
+            raise ValueError(f"IVF-PQ index expects row {self.count}, got {start}")
+        self.count += len(vectors)
+
+        if self.ready:
+            self._encode(np.arange(start, start + len(vectors)), np.asarray(vectors, dtype=np.float32))
+        elif self.count >= self.min_train:
+            self._train()
+
+    def _train(self):
+        """Train coarse centroids and PQ codebooks, then encode every row seen so far"""
+        sample_rows = np.sort(self.rng.choice(self.count, size=min(self.count, 65536), replace=False))
+        sample = self.get_vectors(sample_rows).astype(np.float32)
+        dim = sample.shape[1]
+        if dim % self.pq_m:
+            pq_m = max(m for m in range(1, self.pq_m + 1) if dim % m == 0)
+            print(f"[IVF_PQ] pq_m={self.pq_m} does not divide vector size {dim}, using {pq_m}")
+            self.pq_m = pq_m
+
+        print(f"[IVF_PQ] Training nlist={self.nlist}, pq_m={self.pq_m} on {len(sample)} vectors")
+        centroids = _kmeans(sample, self.nlist, 10, self.rng, spherical=True)
+        residuals = sample - centroids[_assign(sample, centroids, spherical=True)]
+
+        sub_dim = dim // self.pq_m
+        codebooks = np.empty((self.pq_m, 256, sub_dim), dtype=np.float32)
+        for j in range(self.pq_m):
+            codebooks[j] = _kmeans(residuals[:, j * sub_dim:(j + 1) * sub_dim], 256, 10, self.rng)
+
+        self.codebooks = codebooks
+        self.list_rows = [np.zeros(0, dtype=np.int32) for _ in range(self.nlist)]
+        self.list_codes = [np.zeros((0, self.pq_m), dtype=np.uint8) for _ in range(self.nlist)]
+
+        for i in range(0, self.count, 65536):
+            rows = np.arange(i, min(i + 65536, self.count))
+            self._encode(rows, self.get_vectors(rows).astype(np.float32), centroids)
+        # Set last: `ready` flips only once every row seen so far has a code
+        self.centroids = centroids
+
+    def _encode(self, rows: np.ndarray, vectors: np.ndarray, centroids: Optional[np.ndarray] = None):
+        """Assign rows to lists and append their PQ codes"""
+        centroids = self.centroids if centroids is None else centroids
+        lists = _assign(vectors, centroids, spherical=True)
+        residuals = vectors - centroids[lists]
+        sub_dim = self.codebooks.shape[2]
+        codes = np.empty((len(vectors), self.pq_m), dtype=np.uint8)
+        for j in range(self.pq_m):
+            codes[:, j] = _assign(residuals[:, j * sub_dim:(j + 1) * sub_dim], self.codebooks[j])
+
+        for l in np.unique(lists):
+            selected = lists == l
+            self._append_to_list(int(l), rows[selected], codes[selected])
+
+    def _append_to_list(self, l: int, rows: np.ndarray, codes: np.ndarray):
+        """Append to an inverted list, growing its arrays by doubling"""
+        size = self.list_sizes[l]
+        needed = size + len(rows)
+        if needed > len(self.list_rows[l]):
+            capacity = max(needed, 2 * len(self.list_rows[l]), 16)
+            grown_rows = np.zeros(capacity, dtype=np.int32)
+            grown_rows[:size] = self.list_rows[l][:size]
+            grown_codes = np.zeros((capacity, self.pq_m), dtype=np.uint8)
+            grown_codes[:size] = self.list_codes[l][:size]
+            self.list_rows[l] = grown_rows
+            self.list_codes[l] = grown_codes
+        self.list_rows[l][size:needed] = rows
+        self.list_codes[l][size:needed] = codes
+        self.list_sizes[l] = needed
+
+    def search(
+        self,
+        query: np.ndarray,
+        top_k: int,
+        allowed: Optional[np.ndarray] = None,
+        nprobe: Optional[int] = None
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Approximate top-k (rows, exact similarities) among rows where `allowed` is true"""
+        coarse = self.centroids @ query
+        sub_dim = self.codebooks.shape[2]
+        # lut[j, c] = query sub-vector j . codeword c, so a code scores as a sum of table reads
+        lut = np.einsum("jcd,jd->jc", self.codebooks, query.reshape(self.pq_m, sub_dim))
+        subspaces = np.arange(self.pq_m)
+
+        nprobe = min(nprobe or self.nprobe, self.nlist)
+        order = np.argsort(-coarse)
+        probed = 0
+        candidate_rows: List[np.ndarray] = []
+        candidate_scores: List[np.ndarray] = []
+        found = 0
+
+        # Probe more lists until enough allowed rows turn up (filters and tombstones shrink lists)
+        while probed < self.nlist:
+            for l in order[probed:nprobe]:
+                size = self.list_sizes[l]
+                if size == 0:
+                    continue
+                rows = self.list_rows[l][:size]
+                codes = self.list_codes[l][:size]
+                if allowed is not None:
+                    keep = allowed[rows]
+                    rows, codes = rows[keep], codes[keep]
+                candidate_rows.append(rows)
+                candidate_scores.append(coarse[l] + lut[subspaces, codes].sum(axis=1))
+                found += len(rows)
+            probed = nprobe
+            if found >= top_k:
+                break
+            nprobe = min(nprobe * 2, self.nlist)
+
+        if not found:
+            return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.float32)
+
+        rows = np.concatenate(candidate_rows).astype(np.int64)
+        scores = np.concatenate(candidate_scores)
+        keep = min(max(self.rerank, top_k), len(rows))
+        if keep < len(rows):
+            best = np.argpartition(-scores, keep - 1)[:keep]
+            rows = rows[best]
+
+        # Exact re-rank against the original vectors
+        rows = np.sort(rows)
+        exact = self.get_vectors(rows) @ query
+        best = np.argsort(-exact)[:top_k]
+        return rows[best], exact[best].astype(np.float32)
+
+    def save(self, path: Path):
+        """Snapshot codebooks and codes so a restart only encodes rows added since"""
+        arrays = {
+            "count": np.asarray([self.count]),
+            "params": np.asarray(self.params),
+        }
+        if self.ready:
+            arrays["centroids"] = self.centroids
+            arrays["codebooks"] = self.codebooks
+            arrays["list_sizes"] = self.list_sizes
+            arrays["rows"] = np.concatenate([r[:s] for r, s in zip(self.list_rows, self.list_sizes)])
+            arrays["codes"] = np.concatenate([c[:s] for c, s in zip(self.list_codes, self.list_sizes)])
+
+        tmp_path = path.with_suffix(".tmp")
+        with open(tmp_path, "wb") as f:
+            np.savez(f, **arrays)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+
+    def load(self, path: Path) -> bool:
+        """Restore a snapshot written with the same parameters, returns False otherwise"""
+        data = np.load(path)
+        if data["params"].tolist() != self.params or "centroids" not in data:
+            return False
+
+        self.count = int(data["count"][0])
+        self.centroids = data["centroids"]
+        self.codebooks = data["codebooks"]
+        self.pq_m = self.codebooks.shape[0]
+        self.list_sizes = data["list_sizes"].astype(np.int64)
+        bounds = np.concatenate([[0], np.cumsum(self.list_sizes)])
+        rows, codes = data["rows"], data["codes"]
+        self.list_rows = [rows[bounds[l]:bounds[l + 1]].copy() for l in range(self.nlist)]
+        self.list_codes = [codes[bounds[l]:bounds[l + 1]].copy() for l in range(self.nlist)]
+        return True
@@ -18,23 +18,38 @@ class LLMService(ABC):
 
 
 class GroqLLMService(LLMService):
-    """Groq LLM service implementation"""
+    """Groq LLM service implementation
+
+    Uses `AsyncGroq`, so completions and streams are awaited on the event
+    loop instead of blocking it, and concurrent generations share the
+    client's pooled keep-alive connections.
+    """
     
     def __init__(self, api_key: str, model: str = "llama-3.3-70b-versatile"):
-        from groq import Groq
-        self.client = Groq(api_key=api_key)
+        from groq import AsyncGroq
+        self.client = AsyncGroq(api_key=api_key)
         self.model = model
     
-    async def generate(self, prompt: str, system_prompt: str = "") -> str:
-        """Generate a response using Groq"""
+    async def close(self):
+        """Close the Groq client's connections"""
+        await self.client.close()
+    
+    async def warmup(self):
+        """Open the HTTPS connection to Groq ahead of the first completion"""
+        await self.client.models.list()
+    
+    def _messages(self, prompt: str, system_prompt: str):
         messages = []
         if system_prompt:
             messages.append({"role": "system", "content": system_prompt})
         messages.append({"role": "user", "content": prompt})
-        
-        response = self.client.chat.completions.create(
+        return messages
+    
+    async def generate(self, prompt: str, system_prompt: str = "") -> str:
+        """Generate a response using Groq"""
+        response = await self.client.chat.completions.create(
             model=self.model,
-            messages=messages,
+            messages=self._messages(prompt, system_prompt),
             temperature=0.7,
             max_tokens=2048
         )
@@ -43,21 +58,18 @@ class GroqLLMService(LLMService):
     
     async def generate_stream(self, prompt: str, system_prompt: str = "") -> AsyncIterator[str]:
         """Generate a streaming response using Groq"""
-        messages = []
-        if system_prompt:
-            messages.append({"role": "system", "content": system_prompt})
-        messages.append({"role": "user", "content": prompt})
-        
-        stream = self.client.chat.completions.create(
+        stream = await self.client.chat.completions.create(
             model=self.model,
-            messages=messages,
+            messages=self._messages(prompt, system_prompt),
             temperature=0.7,
             max_tokens=2048,
             stream=True
         )
         
-        for chunk in stream:
-            if chunk.choices[0].delta.content:
-                yield chunk.choices[0].delta.content
-
-
+        try:
+            async for chunk in stream:
+                if chunk.choices and chunk.choices[0].delta.content:
+                    yield chunk.choices[0].delta.content
+        finally:
+            # Release the connection if the consumer stops early (client disconnect)
+            await stream.close()
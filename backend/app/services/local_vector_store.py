@@ -0,0 +1,653 @@
+"""In-process NumPy vector store implementation"""
+from typing import List, Dict, Any, Optional
+from pathlib import Path
+import json
+import os
+import uuid
+import numpy as np
+from app.services.vector_store import VectorStore, Vector, Vectors
+
+
+def _normalize(vectors: np.ndarray) -> np.ndarray:
+    """L2-normalize rows so that dot product equals cosine similarity"""
+    norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+    norms[norms == 0] = 1.0  # Leave zero (dummy) vectors untouched
+    return vectors / norms
+
+
+def _top_k(scores: np.ndarray, k: int) -> np.ndarray:
+    """Indices of the k highest scores per row, best first"""
+    n = scores.shape[-1]
+    if k >= n:
+        return np.argsort(-scores, axis=-1)
+    part = np.argpartition(-scores, k - 1, axis=-1)[..., :k]
+    order = np.argsort(-np.take_along_axis(scores, part, axis=-1), axis=-1)
+    return np.take_along_axis(part, order, axis=-1)
+
+
+def _payload_values(value: Any) -> List[Any]:
+    """Values a payload field matches on (arrays match any element, like Qdrant)"""
+    values = value if isinstance(value, (list, tuple)) else [value]
+    return [v for v in values if isinstance(v, (str, int, float, bool))]
+
+
+def _write_json(path: Path, data: Any):
+    """Write a JSON file atomically"""
+    tmp_path = path.with_suffix(path.suffix + ".tmp")
+    with open(tmp_path, "w") as f:
+        json.dump(data, f)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+
+class _Segment:
+    """Immutable block of consecutive rows, optionally backed by files on disk"""
+
+    def __init__(self, start: int, vectors: np.ndarray, name: Optional[str] = None):
+        self.start = start
+        self.vectors = vectors
+        self.name = name
+
+    @property
+    def count(self) -> int:
+        return self.vectors.shape[0]
+
+
+class _Collection:
+    """Append-only row storage for one collection
+
+    Rows are numbered consecutively across a list of immutable segments.
+    Re-upserting an ID writes a new row and marks the old one dead, deletes
+    only flip the `alive` flag, so a row number never changes once written.
+
+    With a `path`, every upsert seals a segment on disk: an `.npy` float32
+    block that is memory-mapped back and a columnar `.payload.json` file.
+    `manifest.jsonl` logs segments and deletes in order and is replayed on
+    load. Small trailing segments are merged log-structured style, so a
+    collection holds O(log n) segments no matter how it was loaded.
+
+    Segment files are named by pid and a random suffix so names never
+    collide, and only segments this instance merged away are unlinked. A
+    `read_only` collection (another process holds the directory's writer
+    lock) never touches the directory.
+    """
+
+    def __init__(self, vector_size: int, path: Optional[Path] = None, read_only: bool = False):
+        self.vector_size = vector_size
+        self.path = path
+        self.read_only = read_only
+        self.segments: List[_Segment] = []
+        self.count = 0
+        self.alive = np.zeros(16, dtype=bool)
+        self.ids: List[str] = []
+        self.payloads: List[Dict[str, Any]] = []
+        self.id_to_row: Dict[str, int] = {}
+        # field -> value -> rows, built lazily the first time a field is filtered on
+        self.field_index: Dict[str, Dict[Any, List[int]]] = {}
+        # Optional ANN index over all rows (see `attach_index`)
+        self.index = None
+        self._index_snapshot_count = 0
+        # Segments merged away since the last manifest rewrite, unlinked after it
+        self._superseded: List[str] = []
+
+        if path is not None and not read_only:
+            path.mkdir(parents=True, exist_ok=True)
+            _write_json(path / "collection.json", {"vector_size": vector_size, "distance": "cosine"})
+
+    @classmethod
+    def load(cls, path: Path, read_only: bool = False) -> "_Collection":
+        """Map a persisted collection back into memory by replaying its manifest"""
+        with open(path / "collection.json") as f:
+            meta = json.load(f)
+
+        collection = cls(meta["vector_size"], read_only=read_only)
+        collection.path = path
+
+        manifest = path / "manifest.jsonl"
+        if not manifest.exists():
+            return collection
+
+        with open(manifest) as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                entry = json.loads(line)
+                if entry["op"] == "segment":
+                    vectors = np.load(path / f"{entry['name']}.npy", mmap_mode="r")
+                    with open(path / f"{entry['name']}.payload.json") as pf:
+                        ids, payloads = cls._decode_payloads(json.load(pf))
+                    collection._add_segment(
+                        _Segment(collection.count, vectors, entry["name"]), ids, payloads, entry.get("dead", [])
+                    )
+                elif entry["op"] == "delete":
+                    for point_id in entry["ids"]:
+                        collection.kill(point_id)
+
+        return collection
+
+    @staticmethod
+    def _encode_payloads(ids: List[str], payloads: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Store payloads column by column (missing fields become null)"""
+        fields = sorted({field for payload in payloads for field in payload})
+        return {
+            "ids": ids,
+            "columns": {field: [payload.get(field) for payload in payloads] for field in fields}
+        }
+
+    @staticmethod
+    def _decode_payloads(data: Dict[str, Any]):
+        payloads: List[Dict[str, Any]] = [{} for _ in data["ids"]]
+        for field, column in data["columns"].items():
+            for payload, value in zip(payloads, column):
+                if value is not None:
+                    payload[field] = value
+        return data["ids"], payloads
+
+    def _grow(self, extra: int):
+        """Grow the alive flags so that `extra` more rows fit"""
+        capacity = self.alive.shape[0]
+        if self.count + extra <= capacity:
+            return
+        while capacity < self.count + extra:
+            capacity *= 2
+        alive = np.zeros(capacity, dtype=bool)
+        alive[:self.count] = self.alive[:self.count]
+        self.alive = alive
+
+    def _add_segment(self, segment: _Segment, ids: List[str], payloads: List[Dict[str, Any]], dead=()):
+        """Register a segment's rows, superseding any live rows with the same IDs"""
+        self._grow(segment.count)
+        dead = set(dead)
+        for offset, (point_id, payload) in enumerate(zip(ids, payloads)):
+            row = segment.start + offset
+            self.ids.append(point_id)
+            self.payloads.append(payload)
+            for field, index in self.field_index.items():
+                if field in payload:
+                    for value in _payload_values(payload[field]):
+                        index.setdefault(value, []).append(row)
+            if offset in dead:
+                continue
+            self.kill(point_id)
+            self.alive[row] = True
+            self.id_to_row[point_id] = row
+        # New list rather than append: the indexing thread may be reading the old one
+        self.segments = self.segments + [segment]
+        self.count += segment.count
+
+    def _write_segment(
+        self,
+        start: int,
+        vectors: np.ndarray,
+        ids: List[str],
+        payloads: List[Dict[str, Any]]
+    ) -> _Segment:
+        """Persist a block of rows and map it back read-only"""
+        # Unique across processes and restarts, unlike a per-process counter
+        name = f"seg_{os.getpid()}_{uuid.uuid4().hex[:12]}"
+        np.save(self.path / f"{name}.npy", np.ascontiguousarray(vectors, dtype=np.float32))
+        _write_json(self.path / f"{name}.payload.json", self._encode_payloads(ids, payloads))
+        return _Segment(start, np.load(self.path / f"{name}.npy", mmap_mode="r"), name)
+
+    def _log(self, entry: Dict[str, Any]):
+        """Append one operation to the manifest"""
+        with open(self.path / "manifest.jsonl", "a") as f:
+            f.write(json.dumps(entry) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+
+    def append(self, ids: List[str], vectors: np.ndarray, payloads: List[Dict[str, Any]]):
+        """Append rows as a new segment"""
+        start = self.count
+        if self.path is None:
+            self._add_segment(_Segment(start, vectors), ids, payloads)
+        else:
+            segment = self._write_segment(start, vectors, ids, payloads)
+            self._add_segment(segment, ids, payloads)
+            self._log({"op": "segment", "name": segment.name, "count": segment.count})
+        self._merge_tail()
+
+    def attach_index(self, make_index):
+        """Attach an ANN index, resuming from an on-disk snapshot if possible
+
+        Rows past the snapshot are not inserted here; `index_pending` does
+        that off the event loop (see `LocalVectorStore._index_in_background`).
+        """
+        index = make_index(self.gather)
+        snapshot = self.path / f"index_{index.name}.npz" if self.path is not None else None
+        if snapshot is not None and snapshot.exists():
+            if not index.load(snapshot) or index.count > self.count:
+                index = make_index(self.gather)
+        self._index_snapshot_count = index.count
+        self.index = index
+
+    @property
+    def index_behind(self) -> bool:
+        return self.index is not None and self.index.count < self.count
+
+    def index_pending(self, batch_size: int = 1024):
+        """Insert up to `batch_size` rows the index has not seen yet (runs in a worker thread)"""
+        start = self.index.count
+        end = min(self.count, start + batch_size)
+        if end > start:
+            self.index.add(start, self.gather(np.arange(start, end)))
+            self._maybe_snapshot_index()
+
+    def _maybe_snapshot_index(self):
+        """Save the index once it has grown by a quarter since the last snapshot"""
+        if self.path is None or self.read_only or self.index.count < 1000:
+            return
+        if self.index.count >= self._index_snapshot_count * 1.25:
+            self.index.save(self.path / f"index_{self.index.name}.npz")
+            self._index_snapshot_count = self.index.count
+
+    def _merge_tail(self):
+        """Merge trailing segments while the newest is at least half the size of the one before"""
+        merged = False
+        while len(self.segments) >= 2 and self.segments[-1].count * 2 >= self.segments[-2].count:
+            older, newer = self.segments[-2], self.segments[-1]
+            self._superseded.extend(old.name for old in (older, newer) if old.name is not None)
+            vectors = np.concatenate([older.vectors, newer.vectors])
+            if self.path is None:
+                segment = _Segment(older.start, vectors)
+            else:
+                end = newer.start + newer.count
+                segment = self._write_segment(older.start, vectors, self.ids[older.start:end], self.payloads[older.start:end])
+            self.segments = self.segments[:-2] + [segment]
+            merged = True
+
+        if merged and self.path is not None:
+            self._rewrite_manifest()
+
+    def _rewrite_manifest(self):
+        """Replace the manifest with the current segment list and drop the segments it superseded"""
+        entries = []
+        for segment in self.segments:
+            dead = np.flatnonzero(~self.alive[segment.start:segment.start + segment.count])
+            entries.append({"op": "segment", "name": segment.name, "count": segment.count, "dead": dead.tolist()})
+
+        tmp_path = self.path / "manifest.jsonl.tmp"
+        with open(tmp_path, "w") as f:
+            for entry in entries:
+                f.write(json.dumps(entry) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.path / "manifest.jsonl")
+
+        # Only files this instance merged away: it holds the writer lock, so
+        # segments it loaded are its own, and nothing else is ever deleted
+        for name in self._superseded:
+            for suffix in (".npy", ".payload.json"):
+                try:
+                    (self.path / f"{name}{suffix}").unlink()
+                except FileNotFoundError:
+                    pass
+        self._superseded = []
+
+    def delete(self, ids: List[str]):
+        """Delete rows by ID"""
+        if self.path is not None:
+            self._log({"op": "delete", "ids": ids})
+        for point_id in ids:
+            self.kill(point_id)
+
+    def kill(self, point_id: str):
+        """Mark the live row of an ID as deleted"""
+        row = self.id_to_row.pop(point_id, None)
+        if row is not None:
+            self.alive[row] = False
+
+    def scores(self, query: np.ndarray) -> np.ndarray:
+        """Similarity of a query (or a (dim, n) matrix of queries) against every row"""
+        return np.concatenate([segment.vectors @ query for segment in self.segments])
+
+    def gather(self, rows: np.ndarray) -> np.ndarray:
+        """Vectors for the given row numbers"""
+        segments = self.segments
+        if len(segments) == 1:
+            return np.asarray(segments[0].vectors[rows])
+        starts = np.array([segment.start for segment in segments])
+        owner = np.searchsorted(starts, rows, side="right") - 1
+        out = np.empty((len(rows), self.vector_size), dtype=np.float32)
+        for i, segment in enumerate(segments):
+            selected = np.flatnonzero(owner == i)
+            if len(selected):
+                out[selected] = segment.vectors[rows[selected] - segment.start]
+        return out
+
+    def _matching(self, field: str, value: Any) -> np.ndarray:
+        """Boolean mask of rows whose payload field equals (or contains) value"""
+        if field not in self.field_index:
+            index: Dict[Any, List[int]] = {}
+            for row, payload in enumerate(self.payloads):
+                if field in payload:
+                    for v in _payload_values(payload[field]):
+                        index.setdefault(v, []).append(row)
+            self.field_index[field] = index
+        matching = np.zeros(self.count, dtype=bool)
+        matching[self.field_index[field].get(value, [])] = True
+        return matching
+
+    def live_mask(
+        self,
+        filter_conditions: Optional[Dict[str, Any]] = None,
+        exclude_conditions: Optional[Dict[str, Any]] = None
+    ) -> np.ndarray:
+        """Boolean mask of live rows matching all equality conditions and none of the exclusions"""
+        mask = self.alive[:self.count].copy()
+        for field, value in (filter_conditions or {}).items():
+            mask &= self._matching(field, value)
+        for field, value in (exclude_conditions or {}).items():
+            mask &= ~self._matching(field, value)
+        return mask
+
+
+class LocalVectorStore(VectorStore):
+    """In-process vector store backed by NumPy
+
+    Answers queries with one matrix multiply per segment plus `argpartition`
+    top-k. Vectors are normalized on insert, so scores are cosine similarities
+    like the Qdrant collections created by `QdrantVectorStore`.
+
+    With `data_dir` set, collections persist as append-only segment files
+    under `{data_dir}/{collection}/` and are memory-mapped on startup instead
+    of being re-ingested. Mapped segments are read through the OS page cache,
+    so uvicorn workers opening the same directory share those pages. The
+    first process to open a directory takes an exclusive `flock` on it and is
+    its only writer; any other process opens it read-only (writes raise) and
+    sees the writer's data after a restart.
+
+    `index="hnsw"` maintains an HNSW graph per collection and `index="ivfpq"`
+    a product-quantized inverted file (codes in RAM, originals only touched to
+    re-rank). Either is used once at least `full_scan_threshold` points pass
+    the filter; smaller candidate sets are scanned exactly, which is both
+    faster and exact at that size. Indexes are built by a background task
+    that inserts rows in a worker thread, so upserts and startup never wait
+    on them; until an index has caught up with its collection, searches
+    scan exactly.
+    """
+
+    # Embeddings are always computed by the caller
+    cloud_inference = False
+
+    def __init__(
+        self,
+        data_dir: Optional[str] = None,
+        index: str = "flat",
+        index_params: Optional[Dict[str, Any]] = None,
+        full_scan_threshold: int = 10000
+    ):
+        if index not in ("flat", "hnsw", "ivfpq"):
+            raise ValueError(f"Unknown local index type: {index}")
+
+        self.data_dir = Path(data_dir) if data_dir else None
+        self.index = index
+        self.index_params = index_params or {}
+        self.full_scan_threshold = full_scan_threshold
+        self.collections: Dict[str, _Collection] = {}
+        # collection name -> task inserting rows the index has not seen yet
+        self._indexing: Dict[str, Any] = {}
+        self.read_only = False
+        self._lock_file = None
+
+        if self.data_dir is not None:
+            self.data_dir.mkdir(parents=True, exist_ok=True)
+            self.read_only = not self._lock_data_dir()
+            for path in sorted(self.data_dir.iterdir()):
+                if (path / "collection.json").exists():
+                    collection = _Collection.load(path, read_only=self.read_only)
+                    self._attach_index(collection)
+                    self.collections[path.name] = collection
+                    print(f"[LOCAL_STORE] Mapped {path.name}: {len(collection.id_to_row)} points")
+
+    def _lock_data_dir(self) -> bool:
+        """Take the directory's exclusive writer lock, False if another process holds it"""
+        import fcntl
+        lock_file = open(self.data_dir / ".lock", "a")
+        try:
+            fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            lock_file.close()
+            print(f"[LOCAL_STORE] {self.data_dir} is locked by another process, opening read-only")
+            return False
+        self._lock_file = lock_file
+        return True
+
+    def _check_writable(self):
+        if self.read_only:
+            raise RuntimeError(
+                f"Local store {self.data_dir} is read-only in this process "
+                f"(another process holds its writer lock)"
+            )
+
+    async def close(self):
+        """Stop background indexing and release the writer lock"""
+        for task in self._indexing.values():
+            task.cancel()
+        self._indexing = {}
+        if self._lock_file is not None:
+            self._lock_file.close()
+            self._lock_file = None
+
+    def _attach_index(self, collection: _Collection):
+        if self.index == "hnsw":
+            from app.services.hnsw_index import HNSWIndex
+            collection.attach_index(lambda get_vectors: HNSWIndex(get_vectors, **self.index_params))
+        elif self.index == "ivfpq":
+            from app.services.ivfpq_index import IVFPQIndex
+            collection.attach_index(lambda get_vectors: IVFPQIndex(get_vectors, **self.index_params))
+
+    async def refresh_collections(self):
+        """Collections are mapped in __init__; start indexing rows past their snapshots"""
+        for collection_name in self.collections:
+            self._index_in_background(collection_name)
+
+    def _index_in_background(self, collection_name: str):
+        """Start catching the collection's index up, unless it is current or already running"""
+        import asyncio
+        collection = self.collections[collection_name]
+        if collection.index_behind and collection_name not in self._indexing:
+            self._indexing[collection_name] = asyncio.ensure_future(self._catch_up_index(collection_name))
+
+    async def _catch_up_index(self, collection_name: str):
+        import asyncio
+        import time
+        collection = self.collections[collection_name]
+        loop = asyncio.get_event_loop()
+        start, first = time.time(), collection.index.count
+        try:
+            # Re-checked after every batch, so rows upserted meanwhile are picked up too
+            while collection.index_behind:
+                await loop.run_in_executor(None, collection.index_pending)
+            print(f"[LOCAL_STORE] Indexed {collection.index.count - first} rows of {collection_name} in {int((time.time() - start) * 1000)}ms")
+        except Exception as e:
+            print(f"[LOCAL_STORE] Indexing {collection_name} failed, searches stay exact: {e}")
+            collection.index = None
+        finally:
+            self._indexing.pop(collection_name, None)
+
+    async def wait_for_index(self, collection_name: str):
+        """Wait until the collection's index covers every row"""
+        self._index_in_background(collection_name)
+        task = self._indexing.get(collection_name)
+        if task is not None:
+            await task
+
+    def _get_collection(self, collection_name: str) -> _Collection:
+        collection = self.collections.get(collection_name)
+        if collection is None:
+            raise ValueError(f"Collection {collection_name} not found")
+        return collection
+
+    async def create_collection(
+        self,
+        collection_name: str,
+        vector_size: Optional[int] = None,
+        profile: Optional[str] = None
+    ):
+        """Create a new collection, or check an existing one matches (profile is Qdrant-only)"""
+        existing = self.collections.get(collection_name)
+        if existing is not None:
+            if existing.vector_size != (vector_size or 384):
+                raise ValueError(
+                    f"Collection {collection_name} has {existing.vector_size}-dim vectors, "
+                    f"expected {vector_size or 384}-dim"
+                )
+            return
+        self._check_writable()
+        path = self.data_dir / collection_name if self.data_dir is not None else None
+        collection = _Collection(vector_size or 384, path)
+        self._attach_index(collection)
+        self.collections[collection_name] = collection
+
+    async def upsert_vectors(
+        self,
+        collection_name: str,
+        vectors: Vectors,
+        payloads: List[Dict[str, Any]],
+        ids: Optional[List[str]] = None,
+        texts: Optional[List[str]] = None
+    ):
+        """Insert or update vectors"""
+        self._check_writable()
+        collection = self._get_collection(collection_name)
+
+        if ids is None:
+            ids = [str(uuid.uuid4()) for _ in payloads]
+
+        matrix = np.asarray(vectors, dtype=np.float32)
+        if matrix.ndim != 2 or matrix.shape[0] != len(payloads) or matrix.shape[1] != collection.vector_size:
+            raise ValueError(
+                f"Expected {len(payloads)} vectors of size {collection.vector_size} "
+                f"for {collection_name}, got shape {matrix.shape}"
+            )
+
+        collection.append([str(point_id) for point_id in ids], _normalize(matrix), list(payloads))
+        self._index_in_background(collection_name)
+
+    async def search(
+        self,
+        collection_name: str,
+        query_vector: Vector,
+        top_k: int = 5,
+        filter_conditions: Optional[Dict[str, Any]] = None,
+        query_text: Optional[str] = None,
+        use_mmr: bool = False,
+        diversity: float = 0.5,
+        oversampling: Optional[float] = None,
+        rescore: Optional[bool] = None,
+        exclude_conditions: Optional[Dict[str, Any]] = None
+    ) -> List[Dict[str, Any]]:
+        """Search for similar vectors (oversampling/rescore only apply to quantized Qdrant collections)"""
+        results = await self.search_batch(
+            collection_name,
+            [query_vector],
+            top_k,
+            filter_conditions,
+            use_mmr=use_mmr,
+            diversity=diversity,
+            exclude_conditions=exclude_conditions
+        )
+        return results[0]
+
+    async def search_batch(
+        self,
+        collection_name: str,
+        query_vectors: Vectors,
+        top_k: int = 5,
+        filter_conditions: Optional[Dict[str, Any]] = None,
+        query_texts: Optional[List[str]] = None,
+        use_mmr: bool = False,
+        diversity: float = 0.5,
+        oversampling: Optional[float] = None,
+        rescore: Optional[bool] = None,
+        exclude_conditions: Optional[Dict[str, Any]] = None
+    ) -> List[List[Dict[str, Any]]]:
+        """Search several queries at once, exact scans share one matrix multiply"""
+        collection = self._get_collection(collection_name)
+        if len(query_vectors) == 0:
+            return []
+        queries = _normalize(np.asarray(query_vectors, dtype=np.float32).reshape(len(query_vectors), -1))
+
+        mask = collection.live_mask(filter_conditions, exclude_conditions)
+        limit = min(100, top_k * 10) if use_mmr else top_k
+        if limit <= 0:
+            return [[] for _ in query_vectors]
+
+        # Only a caught-up index is searched: while rows are pending, the
+        # indexing thread may be mutating it, and it would miss those rows
+        index = collection.index
+        self._index_in_background(collection_name)
+        if (
+            index is not None and index.ready and collection_name not in self._indexing
+            and mask.sum() >= self.full_scan_threshold
+        ):
+            hits = [index.search(query, limit, mask) for query in queries]
+        else:
+            hits = self._exact_search(collection, queries, mask, limit)
+
+        results = []
+        for rows, scores in hits:
+            if use_mmr and len(rows):
+                picked = self._mmr(collection.gather(rows), scores, top_k, diversity)
+                rows, scores = rows[picked], scores[picked]
+            results.append([
+                {
+                    "id": collection.ids[row],
+                    "score": float(score),
+                    "payload": dict(collection.payloads[row])
+                }
+                for row, score in zip(rows.tolist(), scores.tolist())
+            ])
+        return results
+
+    @staticmethod
+    def _exact_search(collection: _Collection, queries: np.ndarray, mask: np.ndarray, limit: int):
+        """Brute-force top rows among the masked ones, best first, as (rows, scores) per query"""
+        rows = np.flatnonzero(mask)
+        if len(rows) == 0:
+            return [(rows, np.zeros(0, dtype=np.float32)) for _ in queries]
+
+        # Gather only small selections, otherwise score every segment in place
+        if len(rows) * 4 < collection.count:
+            scores = queries @ collection.gather(rows).T
+        else:
+            scores = collection.scores(queries.T).T[:, rows]
+
+        best = _top_k(scores, limit)
+        return list(zip(rows[best], np.take_along_axis(scores, best, axis=-1)))
+
+    @staticmethod
+    def _mmr(vectors: np.ndarray, relevance: np.ndarray, top_k: int, diversity: float) -> List[int]:
+        """Greedy maximal marginal relevance over pre-ranked candidates"""
+        similarity = vectors @ vectors.T
+        selected = [0]  # Candidates are sorted, so the most relevant one goes first
+        max_similarity = similarity[0].copy()
+
+        while len(selected) < min(top_k, len(relevance)):
+            mmr = (1.0 - diversity) * relevance - diversity * max_similarity
+            mmr[selected] = -np.inf
+            best = int(np.argmax(mmr))
+            selected.append(best)
+            np.maximum(max_similarity, similarity[best], out=max_similarity)
+
+        return selected
+
+    async def delete(self, collection_name: str, ids: List[str]):
+        """Delete vectors by ID"""
+        self._check_writable()
+        collection = self._get_collection(collection_name)
+        collection.delete([str(point_id) for point_id in ids])
+
+    async def get_by_id(self, collection_name: str, point_id: str) -> Optional[Dict[str, Any]]:
+        """Get a vector by ID"""
+        collection = self._get_collection(collection_name)
+        row = collection.id_to_row.get(str(point_id))
+        if row is None:
+            return None
+        return {
+            "id": collection.ids[row],
+            "payload": dict(collection.payloads[row]),
+            "vector": collection.gather(np.array([row]))[0].tolist()
+        }
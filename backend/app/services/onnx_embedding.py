@@ -0,0 +1,87 @@
+"""ONNX Runtime embedding backend (optionally int8-quantized) for sentence-transformers models"""
+from typing import List, Optional
+from pathlib import Path
+import numpy as np
+
+
+class OnnxEmbeddingModel:
+    """Drop-in for `SentenceTransformer.encode` on ONNX Runtime
+
+    Runs the ONNX export that sentence-transformers publishes with the model
+    (`onnx/model.onnx`) and reproduces its pipeline: mean pooling over the
+    attention mask followed by L2 normalization, so vectors stay compatible
+    with collections built by the PyTorch model. `quantize=True` applies
+    dynamic int8 quantization to the weights once and caches the result.
+
+    Only needs `onnxruntime`, `tokenizers` and `huggingface_hub`, not torch.
+    Check agreement with the PyTorch model with scripts/check_onnx_embeddings.py.
+    """
+
+    def __init__(
+        self,
+        model_name: str = "all-MiniLM-L6-v2",
+        quantize: bool = False,
+        cache_dir: Optional[str] = None,
+        max_seq_length: int = 256,
+        num_threads: Optional[int] = None
+    ):
+        import onnxruntime as ort
+        from tokenizers import Tokenizer
+        from huggingface_hub import hf_hub_download
+
+        repo_id = model_name if "/" in model_name else f"sentence-transformers/{model_name}"
+        model_path = hf_hub_download(repo_id, "onnx/model.onnx", cache_dir=cache_dir)
+        tokenizer_path = hf_hub_download(repo_id, "tokenizer.json", cache_dir=cache_dir)
+
+        if quantize:
+            model_path = self._quantize(model_path)
+
+        self.tokenizer = Tokenizer.from_file(tokenizer_path)
+        self.tokenizer.enable_truncation(max_length=max_seq_length)
+        self.tokenizer.enable_padding()
+
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        if num_threads:
+            options.intra_op_num_threads = num_threads
+        self.session = ort.InferenceSession(model_path, options, providers=["CPUExecutionProvider"])
+        self.input_names = {i.name for i in self.session.get_inputs()}
+        self.model_path = model_path
+
+    @staticmethod
+    def _quantize(model_path: str) -> str:
+        """Dynamic int8 weight quantization, written next to the fp32 model once"""
+        from onnxruntime.quantization import quantize_dynamic, QuantType
+
+        quantized_path = str(Path(model_path).with_name("model_int8.onnx"))
+        if not Path(quantized_path).exists():
+            print(f"[EMBEDDING] Quantizing {model_path} to int8")
+            quantize_dynamic(model_path, quantized_path, weight_type=QuantType.QInt8)
+        return quantized_path
+
+    def token_lengths(self, texts: List[str]) -> List[int]:
+        """Tokens per text after truncation, ignoring padding"""
+        return [sum(e.attention_mask) for e in self.tokenizer.encode_batch(texts)]
+    
+    def encode(self, texts: List[str], batch_size: int = 32, convert_to_numpy: bool = True) -> np.ndarray:
+        """Normalized float32 embeddings, shape (len(texts), dim)"""
+        outputs = []
+        for i in range(0, len(texts), batch_size):
+            encodings = self.tokenizer.encode_batch(texts[i:i + batch_size])
+            input_ids = np.array([e.ids for e in encodings], dtype=np.int64)
+            attention_mask = np.array([e.attention_mask for e in encodings], dtype=np.int64)
+            feeds = {"input_ids": input_ids, "attention_mask": attention_mask}
+            if "token_type_ids" in self.input_names:
+                feeds["token_type_ids"] = np.array([e.type_ids for e in encodings], dtype=np.int64)
+
+            token_embeddings = self.session.run(None, feeds)[0]
+
+            # Mean pooling over real tokens, then L2 normalize (the model's Normalize module)
+            mask = attention_mask[..., None].astype(np.float32)
+            pooled = (token_embeddings * mask).sum(axis=1) / np.clip(mask.sum(axis=1), 1e-9, None)
+            norms = np.linalg.norm(pooled, axis=1, keepdims=True)
+            outputs.append(pooled / np.clip(norms, 1e-12, None))
+
+        if not outputs:
+            return np.zeros((0, 0), dtype=np.float32)
+        return np.concatenate(outputs).astype(np.float32)
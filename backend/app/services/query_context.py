@@ -0,0 +1,28 @@
+"""Per-request query state shared across cache lookup, retrieval and cache store"""
+from typing import Optional
+import numpy as np
+from app.services.document_processor import EmbeddingService
+
+
+class QueryContext:
+    """Carries one query through the pipeline so it is embedded at most once
+
+    The semantic cache lookup, local retrieval and cache store all need the
+    same query vector. Each of them asks the context instead of calling the
+    embedding service, and only the first call pays for the encode.
+    """
+
+    def __init__(self, query: str, embedding_service: EmbeddingService):
+        self.query = query
+        self.embedding_service = embedding_service
+        self.vector: Optional[np.ndarray] = None
+        self.embedding_ms = 0
+
+    async def get_vector(self) -> np.ndarray:
+        """float32 query embedding, computed off the event loop on first use"""
+        if self.vector is None:
+            import time
+            embed_start = time.time()
+            self.vector = await self.embedding_service.embed_text_query_async(self.query)
+            self.embedding_ms = int((time.time() - embed_start) * 1000)
+        return self.vector
@@ -1,9 +1,10 @@
 """RAG pipeline orchestration"""
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, AsyncIterator
 from app.services.vector_store import VectorStore
 from app.services.llm import LLMService
 from app.services.search import SearchService
 from app.services.document_processor import EmbeddingService
+from app.services.query_context import QueryContext
 from app.schemas.query import Source
 import uuid
 from datetime import datetime
@@ -33,11 +34,53 @@ class RAGService:
         filter_classified: bool = True,
         return_timing: bool = False,
         use_mmr: bool = False,
-        diversity: float = 0.5
+        diversity: float = 0.5,
+        context: Optional[QueryContext] = None
     ) -> Dict[str, Any]:
         """Query local knowledge base using RAG"""
         import time
+        prepared = await self.prepare_local(query, top_k, filter_classified, use_mmr, diversity, context)
+        timings = prepared.pop("timings")
+        
+        llm_start = time.time()
+        result = await self.generate(prepared)
+        timings['llm_generation_ms'] = int((time.time() - llm_start) * 1000)
+        
+        if return_timing:
+            result['timings'] = timings
+        
+        return result
+    
+    async def generate(self, prepared: Dict[str, Any]) -> Dict[str, Any]:
+        """Answer a prepared prompt in one LLM call"""
+        answer = await self.llm_service.generate(prepared["user_prompt"], prepared["system_prompt"])
+        return {
+            "answer": answer,
+            "sources": prepared["sources"],
+            "mode": prepared["mode"]
+        }
+    
+    def generate_stream(self, prepared: Dict[str, Any]) -> AsyncIterator[str]:
+        """Stream the answer to a prepared prompt token by token"""
+        return self.llm_service.generate_stream(prepared["user_prompt"], prepared["system_prompt"])
+    
+    async def retrieve_local(
+        self,
+        query: str,
+        top_k: int = 5,
+        filter_classified: bool = True,
+        use_mmr: bool = False,
+        diversity: float = 0.5,
+        context: Optional[QueryContext] = None
+    ) -> Dict[str, Any]:
+        """Search the local knowledge base once
+        
+        Returns chunks (full text), sources and timings. The agent evaluates
+        and then builds its prompt from the same retrieval.
+        """
+        import time
         timings = {}
+        context = context or QueryContext(query, self.embedding_service)
         
         collection_name = f"{self.org_id}_text"
         
@@ -51,51 +94,33 @@ class RAGService:
             query_vector = []  # Not used
             timings['embedding_ms'] = 0  # No local embedding time
         else:
-            # Generate query embedding locally
-            import asyncio
-            embed_start = time.time()
-            loop = asyncio.get_event_loop()
-            query_vector = await loop.run_in_executor(
-                None,
-                self.embedding_service.embed_text_query,
-                query
-            )
-            timings['embedding_ms'] = int((time.time() - embed_start) * 1000)
+            # Local embedding, reused if the cache lookup already computed it
+            embedded = context.vector is not None
+            query_vector = await context.get_vector()
+            timings['embedding_ms'] = 0 if embedded else context.embedding_ms
         
-        # Apply filters
-        filter_conditions = {}
-        if filter_classified:
-            # This will exclude documents with "classified" tag
-            # Note: This is a simplified approach. In production, you'd use Qdrant's filter syntax
-            pass
+        # Exclude documents with the "classified" tag inside the search itself,
+        # so restricted users still get top_k hits
+        exclude_conditions = {"tags": "classified"} if filter_classified else None
         
         search_start = time.time()
         results = await self.vector_store.search(
             collection_name=collection_name,
             query_vector=query_vector,
             top_k=top_k,
-            filter_conditions=filter_conditions,
             use_mmr=use_mmr,
             diversity=diversity,
-            query_text=query if use_cloud else None  # Pass text for cloud inference
+            query_text=query if use_cloud else None,  # Pass text for cloud inference
+            exclude_conditions=exclude_conditions
         )
         timings['qdrant_search_ms'] = int((time.time() - search_start) * 1000)
         
-        # Filter out classified documents if needed
-        if filter_classified:
-            results = [
-                r for r in results
-                if "classified" not in r["payload"].get("tags", [])
-            ]
-        
-        # Assemble context from retrieved chunks
-        context_parts = []
+        chunks = []
         sources = []
-        
-        for i, result in enumerate(results[:top_k]):
+        for result in results[:top_k]:
             payload = result["payload"]
             chunk_text = payload.get("content", "")
-            context_parts.append(f"[Source {i+1}] {chunk_text}")
+            chunks.append(chunk_text)
             
             sources.append(Source(
                 doc_name=payload.get("filename", "Unknown"),
@@ -105,74 +130,92 @@ class RAGService:
                 score=result["score"]
             ))
         
-        context = "\n\n".join(context_parts)
+        return {"chunks": chunks, "sources": sources, "timings": timings}
+    
+    async def search_internet(self, query: str, num_results: int = 5) -> Dict[str, Any]:
+        """Run the internet search once, returns snippets and sources"""
+        search_results = await self.search_service.search(query, num_results)
+        
+        snippets = []
+        sources = []
+        for result in search_results:
+            snippet = result.get("snippet", "")
+            snippets.append(snippet)
+            
+            sources.append(Source(
+                doc_name=result.get("title", "Internet Source"),
+                doc_id=result.get("url", ""),
+                chunk_text=snippet[:200],
+                score=result.get("score", 0.0)
+            ))
+        
+        return {"snippets": snippets, "sources": sources}
+    
+    @staticmethod
+    def _numbered(texts: List[str], start: int = 1) -> str:
+        return "\n\n".join(f"[Source {start + i}] {text}" for i, text in enumerate(texts))
+    
+    async def prepare_local(
+        self,
+        query: str,
+        top_k: int = 5,
+        filter_classified: bool = True,
+        use_mmr: bool = False,
+        diversity: float = 0.5,
+        context: Optional[QueryContext] = None,
+        retrieved: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
+        """Build the local answer prompt, without generating
+        
+        Pass `retrieved` (from `retrieve_local`) to reuse a search already
+        made. Returns system_prompt, user_prompt, sources, mode and timings,
+        for `generate` or `generate_stream`.
+        """
+        if retrieved is None:
+            retrieved = await self.retrieve_local(query, top_k, filter_classified, use_mmr, diversity, context)
         
-        # Generate response
         system_prompt = """You are a helpful AI assistant. Answer the user's question based on the provided context.
 If the context doesn't contain enough information to answer the question, say so clearly.
 Always cite your sources by mentioning [Source N] when using information from the context."""
         
         user_prompt = f"""Context:
-{context}
+{self._numbered(retrieved["chunks"])}
 
 User Question: {query}
 
 Please provide a comprehensive answer based on the context above."""
         
-        llm_start = time.time()
-        answer = await self.llm_service.generate(user_prompt, system_prompt)
-        timings['llm_generation_ms'] = int((time.time() - llm_start) * 1000)
-        
-        result = {
-            "answer": answer,
-            "sources": sources,
-            "mode": "local"
+        return {
+            "system_prompt": system_prompt,
+            "user_prompt": user_prompt,
+            "sources": retrieved["sources"],
+            "mode": "local",
+            "timings": dict(retrieved["timings"])
         }
-        
-        if return_timing:
-            result['timings'] = timings
-        
-        return result
     
     async def query_internet(self, query: str, num_results: int = 5) -> Dict[str, Any]:
         """Query internet using search service"""
-        # Search the internet
-        search_results = await self.search_service.search(query, num_results)
-        
-        # Assemble context from search results
-        context_parts = []
-        sources = []
-        
-        for i, result in enumerate(search_results):
-            snippet = result.get("snippet", "")
-            context_parts.append(f"[Source {i+1}] {snippet}")
-            
-            sources.append(Source(
-                doc_name=result.get("title", "Internet Source"),
-                doc_id=result.get("url", ""),
-                chunk_text=snippet[:200],
-                score=result.get("score", 0.0)
-            ))
-        
-        context = "\n\n".join(context_parts)
+        return await self.generate(await self.prepare_internet(query, num_results))
+    
+    async def prepare_internet(self, query: str, num_results: int = 5) -> Dict[str, Any]:
+        """Search the internet and build the answer prompt, without generating"""
+        found = await self.search_internet(query, num_results)
         
-        # Generate response
         system_prompt = """You are a helpful AI assistant with access to internet search results.
 Answer the user's question based on the provided search results.
 Always cite your sources by mentioning [Source N] when using information."""
         
         user_prompt = f"""Search Results:
-{context}
+{self._numbered(found["snippets"])}
 
 User Question: {query}
 
 Please provide a comprehensive answer based on the search results above."""
         
-        answer = await self.llm_service.generate(user_prompt, system_prompt)
-        
         return {
-            "answer": answer,
-            "sources": sources,
+            "system_prompt": system_prompt,
+            "user_prompt": user_prompt,
+            "sources": found["sources"],
             "mode": "internet"
         }
     
@@ -182,39 +225,60 @@ Please provide a comprehensive answer based on the search results above."""
         top_k: int = 5,
         filter_classified: bool = True,
         use_mmr: bool = False,
-        diversity: float = 0.5
+        diversity: float = 0.5,
+        context: Optional[QueryContext] = None
     ) -> Dict[str, Any]:
         """Query both local and internet, then fuse results"""
-        # Run both queries in parallel (simplified - not truly parallel here)
-        local_result = await self.query_local(query, top_k, filter_classified, use_mmr=use_mmr, diversity=diversity)
-        internet_result = await self.query_internet(query, top_k)
-        
-        # Combine sources
-        all_sources = local_result["sources"] + internet_result["sources"]
+        return await self.generate(
+            await self.prepare_hybrid(query, top_k, filter_classified, use_mmr, diversity, context)
+        )
+    
+    async def prepare_hybrid(
+        self,
+        query: str,
+        top_k: int = 5,
+        filter_classified: bool = True,
+        use_mmr: bool = False,
+        diversity: float = 0.5,
+        context: Optional[QueryContext] = None,
+        retrieved: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
+        """Put local chunks and internet snippets in one prompt, without generating
         
-        # Combine contexts for final synthesis
-        combined_context = f"""Local Knowledge Base Information:
-{local_result['answer']}
-
-Internet Search Information:
-{internet_result['answer']}"""
+        The internet search runs concurrently with the local one, or alone
+        when `retrieved` is passed. Sources are numbered local first, so
+        [Source N] matches the order of the returned sources.
+        """
+        import asyncio
+        if retrieved is None:
+            retrieved, found = await asyncio.gather(
+                self.retrieve_local(query, top_k, filter_classified, use_mmr, diversity, context),
+                self.search_internet(query, top_k)
+            )
+        else:
+            found = await self.search_internet(query, top_k)
         
         system_prompt = """You are a helpful AI assistant with access to both internal documents and internet information.
 Synthesize information from both sources to provide a comprehensive answer.
-If there are conflicts, note them. Indicate which information comes from internal docs vs. internet."""
+If there are conflicts, note them. Indicate which information comes from internal docs vs. internet.
+Always cite your sources by mentioning [Source N] when using information."""
         
-        user_prompt = f"""{combined_context}
+        user_prompt = f"""Local Knowledge Base:
+{self._numbered(retrieved["chunks"])}
+
+Internet Search Results:
+{self._numbered(found["snippets"], start=len(retrieved["chunks"]) + 1)}
 
 User Question: {query}
 
 Please provide a comprehensive answer that synthesizes both sources of information."""
         
-        final_answer = await self.llm_service.generate(user_prompt, system_prompt)
-        
         return {
-            "answer": final_answer,
-            "sources": all_sources,
-            "mode": "hybrid"
+            "system_prompt": system_prompt,
+            "user_prompt": user_prompt,
+            "sources": retrieved["sources"] + found["sources"],
+            "mode": "hybrid",
+            "timings": dict(retrieved["timings"])
         }
     
     def _detect_intent(self, query: str) -> str:
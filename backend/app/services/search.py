@@ -21,6 +21,10 @@ class PerplexitySearchService(SearchService):
         self.base_url = "https://api.perplexity.ai"
         self.client = httpx.AsyncClient(timeout=30.0)
     
+    async def close(self):
+        """Close the HTTP client's connections"""
+        await self.client.aclose()
+    
     async def search(self, query: str, num_results: int = 5) -> List[Dict[str, str]]:
         """Search using Perplexity API"""
         headers = {
@@ -4,6 +4,7 @@ from datetime import datetime, timedelta
 import uuid
 from app.services.vector_store import VectorStore
 from app.services.document_processor import EmbeddingService
+from app.services.query_context import QueryContext
 from app.schemas.query import Source
 
 
@@ -24,24 +25,31 @@ class SemanticCache:
         self.similarity_threshold = similarity_threshold
         self.ttl_hours = ttl_hours
         self.collection_name = f"{org_id}_query_cache"
+        self._initialized = False
     
     async def initialize(self):
-        """Create cache collection if it doesn't exist"""
+        """Create cache collection if it doesn't exist (no-op after the first call)"""
+        if self._initialized:
+            return
         # For cloud inference, we need to create with Document support
         # For regular mode, create with fixed size (384)
         vector_size = None if (hasattr(self.vector_store, 'cloud_inference') and self.vector_store.cloud_inference) else 384
         await self.vector_store.create_collection(self.collection_name, vector_size)
+        self._initialized = True
     
     async def get(
         self,
         query: str,
-        user_id: Optional[str] = None
+        user_id: Optional[str] = None,
+        context: Optional[QueryContext] = None
     ) -> Optional[Dict[str, Any]]:
         """
         Check if similar query exists in cache
         
+        Pass the request's QueryContext so the query vector is reused downstream.
         Returns cached result if similarity > threshold, None otherwise
         """
+        context = context or QueryContext(query, self.embedding_service)
         try:
             import time
             
@@ -73,17 +81,9 @@ class SemanticCache:
                 print(f"[CACHE GET] Total cloud operation: {cloud_total_time}ms")
                 search_time = int((time.time() - search_start) * 1000)
             else:
-                # Regular mode: generate embedding locally
-                import asyncio
-                loop = asyncio.get_event_loop()
-                embedding_start = time.time()
-                query_vector = await loop.run_in_executor(
-                    None,
-                    self.embedding_service.embed_text_query,
-                    query
-                )
-                embedding_time = int((time.time() - embedding_start) * 1000)
-                print(f"[CACHE GET] Embedding took: {embedding_time}ms")
+                # Regular mode: embed locally (shared with retrieval through the context)
+                query_vector = await context.get_vector()
+                print(f"[CACHE GET] Embedding took: {context.embedding_ms}ms")
                 
                 # Search with the vector
                 print(f"[CACHE GET] Searching for query: {query[:50]}...")
@@ -168,9 +168,11 @@ class SemanticCache:
         sources: List[Source],
         mode: str,
         user_id: Optional[str] = None,
-        metadata: Optional[Dict] = None
+        metadata: Optional[Dict] = None,
+        context: Optional[QueryContext] = None
     ):
-        """Store query result in cache"""
+        """Store query result in cache (reuses the context's query vector if already computed)"""
+        context = context or QueryContext(query, self.embedding_service)
         try:
             # Prepare payload
             payload = {
@@ -210,14 +212,8 @@ class SemanticCache:
                 )
                 print(f"[CACHE SET] Successfully cached with cloud inference: {cache_id}")
             else:
-                # Regular mode: generate embedding locally
-                import asyncio
-                loop = asyncio.get_event_loop()
-                query_vector = await loop.run_in_executor(
-                    None,
-                    self.embedding_service.embed_text_query,
-                    query
-                )
+                # Regular mode: local embedding, computed once per request
+                query_vector = await context.get_vector()
                 await self.vector_store.upsert_vectors(
                     collection_name=self.collection_name,
                     vectors=[query_vector],
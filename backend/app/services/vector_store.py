@@ -1,42 +1,83 @@
 """Qdrant vector store implementation"""
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Union
 import uuid
 import time
 from abc import ABC, abstractmethod
+import numpy as np
+
+
+# Vectors may be plain lists or float32 arrays; arrays stay arrays until the transport edge
+Vector = Union[List[float], np.ndarray]
+Vectors = Union[List[List[float]], List[np.ndarray], np.ndarray]
+
+
+def _as_list(vector: Vector) -> List[float]:
+    """Serialize a query vector for the Qdrant client"""
+    return vector.tolist() if isinstance(vector, np.ndarray) else vector
 
 
 class VectorStore(ABC):
     """Abstract base class for vector stores"""
     
     @abstractmethod
-    async def create_collection(self, collection_name: str, vector_size: Optional[int] = None):
-        """Create a new collection"""
+    async def create_collection(
+        self,
+        collection_name: str,
+        vector_size: Optional[int] = None,
+        profile: Optional[str] = None
+    ):
+        """Create a new collection (profile: key of COLLECTION_PROFILES, None = store default)"""
         pass
     
     @abstractmethod
     async def upsert_vectors(
         self,
         collection_name: str,
-        vectors: List[List[float]],
+        vectors: Vectors,
         payloads: List[Dict[str, Any]],
         ids: Optional[List[str]] = None,
         texts: Optional[List[str]] = None
     ):
-        """Insert or update vectors"""
+        """Insert or update vectors (nested lists or a float32 (n, dim) array)"""
         pass
     
     @abstractmethod
     async def search(
         self,
         collection_name: str,
-        query_vector: List[float],
+        query_vector: Vector,
         top_k: int = 5,
         filter_conditions: Optional[Dict[str, Any]] = None,
         query_text: Optional[str] = None,
         use_mmr: bool = False,
-        diversity: float = 0.5
+        diversity: float = 0.5,
+        oversampling: Optional[float] = None,
+        rescore: Optional[bool] = None,
+        exclude_conditions: Optional[Dict[str, Any]] = None
     ) -> List[Dict[str, Any]]:
-        """Search for similar vectors"""
+        """Search for similar vectors
+
+        filter_conditions: payload values every hit must match
+        exclude_conditions: payload values no hit may match (e.g. {"tags": "classified"})
+        oversampling/rescore: None = profile default
+        """
+        pass
+    
+    @abstractmethod
+    async def search_batch(
+        self,
+        collection_name: str,
+        query_vectors: Vectors,
+        top_k: int = 5,
+        filter_conditions: Optional[Dict[str, Any]] = None,
+        query_texts: Optional[List[str]] = None,
+        use_mmr: bool = False,
+        diversity: float = 0.5,
+        oversampling: Optional[float] = None,
+        rescore: Optional[bool] = None,
+        exclude_conditions: Optional[Dict[str, Any]] = None
+    ) -> List[List[Dict[str, Any]]]:
+        """Search several queries in one round trip, one result list per query"""
         pass
     
     @abstractmethod
@@ -50,68 +91,296 @@ class VectorStore(ABC):
         pass
 
 
+# Collection storage profiles, selected with QDRANT_COLLECTION_PROFILE
+# - quantization: None, "scalar" (int8, 4x smaller) or "binary" (1 bit/dim, 32x smaller)
+# - on_disk: keep original float32 vectors on disk, only quantized ones in RAM
+# - oversampling/rescore: fetch oversampling * top_k by quantized score, re-score with originals
+COLLECTION_PROFILES: Dict[str, Dict[str, Any]] = {
+    "default": {"quantization": None, "on_disk": False, "oversampling": None, "rescore": None},
+    "scalar": {"quantization": "scalar", "on_disk": True, "oversampling": 2.0, "rescore": True},
+    "binary": {"quantization": "binary", "on_disk": True, "oversampling": 3.0, "rescore": True},
+}
+
+# Payload indexes created with every collection, so filtered searches and deletes
+# don't fall back to full scans (field -> Qdrant payload schema type)
+PAYLOAD_INDEXES: Dict[str, str] = {
+    "tags": "keyword",
+    "doc_id": "keyword",
+    "source": "keyword",
+    "user_id": "keyword",
+}
+
+# Extra indexes for semantic cache collections ({org_id}_query_cache)
+CACHE_PAYLOAD_INDEXES: Dict[str, str] = {
+    "timestamp": "datetime",
+}
+
+
 class QdrantVectorStore(VectorStore):
     """Qdrant cloud vector store implementation"""
     
-    def __init__(self, url: str, api_key: Optional[str] = None, cloud_inference: bool = False):
-        from qdrant_client import QdrantClient
+    # Points per upsert request for pre-computed vectors
+    UPSERT_BATCH = 256
+    
+    def __init__(
+        self,
+        url: str,
+        api_key: Optional[str] = None,
+        cloud_inference: bool = False,
+        profile: str = "default",
+        oversampling: Optional[float] = None,
+        rescore: Optional[bool] = None,
+        http_client=None,
+        prefer_grpc: bool = False,
+        grpc_port: int = 6334
+    ):
+        from qdrant_client import AsyncQdrantClient
         from qdrant_client.models import Distance, VectorParams
         
+        if profile not in COLLECTION_PROFILES:
+            raise ValueError(f"Unknown collection profile: {profile}")
+        
         # cloud_inference parameter doesn't exist - it's determined by the vector format
-        self.client = QdrantClient(url=url, api_key=api_key)
+        # With prefer_grpc, client calls (search, upsert, retrieve, delete) go over gRPC;
+        # cloud inference requests still use REST
+        self.client = AsyncQdrantClient(
+            url=url,
+            api_key=api_key,
+            prefer_grpc=prefer_grpc,
+            grpc_port=grpc_port
+        )
+        self._sync_client = None
+        self.url = url
+        self.prefer_grpc = prefer_grpc
+        self.grpc_port = grpc_port
         self.api_key = api_key  # Store for REST API calls
+        # Cloud inference REST calls reuse one pooled client instead of a new connection per call
+        self._owns_http_client = http_client is None
+        self.http_client = http_client or create_http_client()
         self.cloud_inference = cloud_inference
+        self.profile = profile
+        # Explicit settings override the profile's search defaults
+        self.oversampling = oversampling if oversampling is not None else COLLECTION_PROFILES[profile]["oversampling"]
+        self.rescore = rescore if rescore is not None else COLLECTION_PROFILES[profile]["rescore"]
         self.Distance = Distance
         self.VectorParams = VectorParams
+        # Collection registry (name -> CollectionInfo), loaded on first create_collection
+        self._collections: Optional[Dict[str, Any]] = None
+        self._indexed = set()
+        self._collections_lock = None
+    
+    @property
+    def sync_client(self):
+        """Blocking QdrantClient for scripts, created on first use (the app only uses `client`)"""
+        if self._sync_client is None:
+            from qdrant_client import QdrantClient
+            self._sync_client = QdrantClient(
+                url=self.url,
+                api_key=self.api_key,
+                prefer_grpc=self.prefer_grpc,
+                grpc_port=self.grpc_port
+            )
+        return self._sync_client
+    
+    async def close(self):
+        """Close the async client's connections (a shared HTTP pool is closed by its owner)"""
+        await self.client.close()
+        if self._owns_http_client:
+            await self.http_client.aclose()
+        if self._sync_client is not None:
+            self._sync_client.close()
+    
+    def _quantization_config(self, profile: str):
+        """Qdrant quantization config for a collection profile"""
+        from qdrant_client import models
+        
+        quantization = COLLECTION_PROFILES[profile]["quantization"]
+        if quantization == "scalar":
+            return models.ScalarQuantization(
+                scalar=models.ScalarQuantizationConfig(
+                    type=models.ScalarType.INT8,
+                    quantile=0.99,
+                    always_ram=True
+                )
+            )
+        if quantization == "binary":
+            return models.BinaryQuantization(
+                binary=models.BinaryQuantizationConfig(always_ram=True)
+            )
+        return None
+    
+    def _search_params(self, oversampling: Optional[float], rescore: Optional[bool]):
+        """Quantization search params, None when the store is not quantized"""
+        from qdrant_client import models
+        
+        oversampling = oversampling if oversampling is not None else self.oversampling
+        rescore = rescore if rescore is not None else self.rescore
+        if oversampling is None and rescore is None:
+            return None
+        return models.SearchParams(
+            quantization=models.QuantizationSearchParams(
+                ignore=False,
+                rescore=rescore,
+                oversampling=oversampling
+            )
+        )
+    
+    @staticmethod
+    def _build_filter(
+        filter_conditions: Optional[Dict[str, Any]],
+        exclude_conditions: Optional[Dict[str, Any]] = None
+    ):
+        """Qdrant filter matching all equality conditions and none of the exclusions"""
+        from qdrant_client.models import Filter, FieldCondition, MatchValue
+        
+        if not filter_conditions and not exclude_conditions:
+            return None
+        return Filter(
+            must=[
+                FieldCondition(key=key, match=MatchValue(value=value))
+                for key, value in (filter_conditions or {}).items()
+            ] or None,
+            must_not=[
+                FieldCondition(key=key, match=MatchValue(value=value))
+                for key, value in (exclude_conditions or {}).items()
+            ] or None
+        )
     
-    async def create_collection(self, collection_name: str, vector_size: Optional[int] = None):
-        """Create a new collection"""
+    def _build_query(self, query_vector: Vector, top_k: int, use_mmr: bool, diversity: float):
+        """Nearest-neighbour query, with MMR re-ranking if requested"""
+        from qdrant_client import models
+        
+        query_vector = _as_list(query_vector)
+        if not use_mmr:
+            return query_vector
+        return models.NearestQuery(
+            nearest=query_vector,
+            mmr=models.Mmr(
+                diversity=diversity,  # 0.0 = relevance, 1.0 = diversity
+                candidates_limit=min(100, top_k * 10)  # get more candidates for diversity
+            )
+        )
+    
+    async def create_collection(
+        self,
+        collection_name: str,
+        vector_size: Optional[int] = None,
+        profile: Optional[str] = None
+    ):
+        """Create a new collection, or check an existing one matches (no round trip once registered)"""
         import asyncio
-        try:
-            loop = asyncio.get_event_loop()
-            
-            if self.cloud_inference and vector_size is None:
-                # For cloud inference with Document-based queries, still need vector config
-                await loop.run_in_executor(
-                    None,
-                    lambda: self.client.create_collection(
-                        collection_name=collection_name,
-                        vectors_config=self.VectorParams(
-                            size=384,
-                            distance=self.Distance.COSINE
+        profile = profile or self.profile
+        if profile not in COLLECTION_PROFILES:
+            raise ValueError(f"Unknown collection profile: {profile}")
+        
+        # Cloud inference (Document-based queries) still needs a vector config,
+        # sized for the 384-dim all-minilm-l6-v2 model
+        vector_size = vector_size or 384
+        
+        info = self._collections.get(collection_name) if self._collections is not None else None
+        if info is None or collection_name not in self._indexed:
+            if self._collections_lock is None:
+                self._collections_lock = asyncio.Lock()
+            async with self._collections_lock:
+                if self._collections is None:
+                    await self.refresh_collections()
+                info = self._collections.get(collection_name)
+                if info is None:
+                    try:
+                        await self.client.create_collection(
+                            collection_name=collection_name,
+                            vectors_config=self.VectorParams(
+                                size=vector_size,
+                                distance=self.Distance.COSINE,
+                                on_disk=COLLECTION_PROFILES[profile]["on_disk"]
+                            ),
+                            quantization_config=self._quantization_config(profile)
                         )
-                    )
+                        print(f"[VECTOR_STORE] Created collection {collection_name}")
+                    except Exception as e:
+                        # Another process may have created it since the registry was loaded
+                        print(f"Collection creation: {e}")
+                    info = await self.client.get_collection(collection_name)
+                    self._collections[collection_name] = info
+                if collection_name not in self._indexed:
+                    await self._ensure_payload_indexes(collection_name, info)
+                    self._indexed.add(collection_name)
+        
+        self._validate_collection(collection_name, info, vector_size)
+    
+    async def refresh_collections(self) -> Dict[str, Any]:
+        """Reload the collection registry from Qdrant (at startup, or after out-of-band changes)"""
+        import asyncio
+        response = await self.client.get_collections()
+        names = [collection.name for collection in response.collections]
+        infos = await asyncio.gather(*[self.client.get_collection(name) for name in names])
+        self._collections = dict(zip(names, infos))
+        self._indexed.intersection_update(names)
+        print(f"[VECTOR_STORE] Registry loaded: {len(names)} collections")
+        return self._collections
+    
+    async def open_http_client(self):
+        """Open the pooled REST connection cloud-inference requests use (TLS/HTTP-2 handshake)"""
+        url = f"{self.client._client.rest_uri}/collections"
+        response = await self.http_client.get(url, headers={"api-key": self.api_key or ""})
+        if response.status_code != 200:
+            raise Exception(f"Qdrant REST check failed: {response.status_code} - {response.text}")
+    
+    def _validate_collection(self, collection_name: str, info, vector_size: int):
+        """Raise if an existing collection's vectors don't match what the caller expects"""
+        params = info.config.params.vectors
+        if not isinstance(params, self.VectorParams):
+            return  # Named vectors, not created by this store
+        if params.size != vector_size or params.distance != self.Distance.COSINE:
+            raise ValueError(
+                f"Collection {collection_name} has {params.size}-dim {params.distance.value} vectors, "
+                f"expected {vector_size}-dim Cosine"
+            )
+    
+    async def _ensure_payload_indexes(self, collection_name: str, info):
+        """Create missing payload indexes for filtered fields (idempotent)"""
+        import asyncio
+        from qdrant_client.models import PayloadSchemaType
+        
+        indexes = dict(PAYLOAD_INDEXES)
+        if collection_name.endswith("_query_cache"):
+            indexes.update(CACHE_PAYLOAD_INDEXES)
+        
+        missing = {
+            field: schema for field, schema in indexes.items()
+            if field not in (info.payload_schema or {})
+        }
+        if not missing:
+            return
+        
+        results = await asyncio.gather(
+            *[
+                self.client.create_payload_index(
+                    collection_name=collection_name,
+                    field_name=field,
+                    field_schema=PayloadSchemaType(schema)
                 )
+                for field, schema in missing.items()
+            ],
+            return_exceptions=True
+        )
+        for field, result in zip(missing, results):
+            if isinstance(result, Exception):
+                print(f"Payload index creation ({field}): {result}")
             else:
-                # For regular mode, specify the vector size
-                await loop.run_in_executor(
-                    None,
-                    lambda: self.client.create_collection(
-                        collection_name=collection_name,
-                        vectors_config=self.VectorParams(
-                            size=vector_size or 384,
-                            distance=self.Distance.COSINE
-                        )
-                    )
-                )
-        except Exception as e:
-            # Collection might already exist
-            print(f"Collection creation: {e}")
+                print(f"[VECTOR_STORE] Indexed {collection_name}.{field} ({missing[field]})")
     
     async def upsert_vectors(
         self,
         collection_name: str,
-        vectors: List[List[float]],
+        vectors: Vectors,
         payloads: List[Dict[str, Any]],
         ids: Optional[List[str]] = None,
         texts: Optional[List[str]] = None
     ):
         """Insert or update vectors"""
-        import asyncio
-        import httpx
-        
         if ids is None:
-            ids = [str(uuid.uuid4()) for _ in vectors]
+            ids = [str(uuid.uuid4()) for _ in payloads]
         
         # If cloud inference and texts provided, use REST API for cloud embedding
         if self.cloud_inference and texts:
@@ -136,60 +405,49 @@ class QdrantVectorStore(VectorStore):
             
             data = {"points": points_data}
             
-            async with httpx.AsyncClient(timeout=30.0) as client:
-                response = await client.put(url, json=data, headers=headers)
-                if response.status_code not in [200, 201]:
-                    print(f"[VECTOR_STORE] Cloud upsert failed: {response.status_code} - {response.text}")
-                    raise Exception(f"Qdrant upsert failed: {response.status_code} - {response.text}")
-                print(f"[VECTOR_STORE] Successfully uploaded {len(points_data)} points with cloud inference")
+            response = await self.http_client.put(url, json=data, headers=headers)
+            if response.status_code not in [200, 201]:
+                print(f"[VECTOR_STORE] Cloud upsert failed: {response.status_code} - {response.text}")
+                raise Exception(f"Qdrant upsert failed: {response.status_code} - {response.text}")
+            print(f"[VECTOR_STORE] Successfully uploaded {len(points_data)} points with cloud inference")
         else:
-            # Regular mode: use Python client with pre-computed vectors
-            from qdrant_client.models import PointStruct
+            # Regular mode: pre-computed vectors, sent as column batches. The
+            # float32 matrix is only turned into Python floats one slice at a
+            # time, right before the request is serialized.
+            from qdrant_client import models
             
-            points = [
-                PointStruct(
-                    id=point_id,
-                    vector=vector,
-                    payload=payload
-                )
-                for point_id, vector, payload in zip(ids, vectors, payloads)
-            ]
-            
-            loop = asyncio.get_event_loop()
-            await loop.run_in_executor(
-                None,
-                lambda: self.client.upsert(
+            matrix = np.asarray(vectors, dtype=np.float32)
+            ids = list(ids)
+            for start in range(0, len(ids), self.UPSERT_BATCH):
+                end = start + self.UPSERT_BATCH
+                await self.client.upsert(
                     collection_name=collection_name,
-                    points=points
+                    points=models.Batch(
+                        ids=ids[start:end],
+                        vectors=matrix[start:end].tolist(),
+                        payloads=list(payloads[start:end])
+                    )
                 )
-            )
     
     async def search(
         self,
         collection_name: str,
-        query_vector: List[float],
+        query_vector: Vector,
         top_k: int = 5,
         filter_conditions: Optional[Dict[str, Any]] = None,
         query_text: Optional[str] = None,
         use_mmr: bool = False,
-        diversity: float = 0.5
+        diversity: float = 0.5,
+        oversampling: Optional[float] = None,
+        rescore: Optional[bool] = None,
+        exclude_conditions: Optional[Dict[str, Any]] = None
     ) -> List[Dict[str, Any]]:
         """Search for similar vectors"""
-        import asyncio
-        from qdrant_client.models import Filter, FieldCondition, MatchValue
-        
-        search_filter = None
-        if filter_conditions:
-            conditions = [
-                FieldCondition(key=key, match=MatchValue(value=value))
-                for key, value in filter_conditions.items()
-            ]
-            search_filter = Filter(must=conditions)
+        search_params = self._search_params(oversampling, rescore)
+        search_filter = self._build_filter(filter_conditions, exclude_conditions)
         
         # If cloud inference and query_text provided, use REST API for cloud embedding
         if self.cloud_inference and query_text:
-            import httpx
-            
             # Use REST API directly for cloud inference
             url = f"{self.client._client.rest_uri}/collections/{collection_name}/points/query"
             headers = {
@@ -205,98 +463,77 @@ class QdrantVectorStore(VectorStore):
                 "limit": top_k,
                 "with_payload": True
             }
+            if search_filter is not None:
+                data["filter"] = search_filter.model_dump(exclude_none=True)
+            if search_params is not None:
+                data["params"] = search_params.model_dump(exclude_none=True)
             
             print(f"[VECTOR_STORE] Cloud query URL: {url}")
             print(f"[VECTOR_STORE] Query text: {query_text[:50]}...")
             
-            async with httpx.AsyncClient(timeout=30.0) as http_client:
-                network_start = time.time()
-                response = await http_client.post(url, json=data, headers=headers)
-                total_call_time = (time.time() - network_start) * 1000
-                
-                print(f"[VECTOR_STORE] Response status: {response.status_code}")
-                
-                if response.status_code != 200:
-                    print(f"[VECTOR_STORE] Cloud query failed: {response.status_code} - {response.text}")
-                    raise Exception(f"Qdrant query failed: {response.status_code} - {response.text}")
-                
-                result = response.json()
-                points = result.get("result", {}).get("points", [])
-                qdrant_server_time = result.get("time", 0) * 1000  # Qdrant's reported server time
-                network_time = total_call_time - qdrant_server_time
-                usage = result.get("usage", {})
-                
-                # Estimate embedding vs search time based on typical ratios
-                # Embedding typically takes 60-70% of Qdrant server time
-                estimated_embedding_time = qdrant_server_time * 0.65
-                estimated_search_time = qdrant_server_time * 0.35
-                
-                print(f"[VECTOR_STORE] Cloud query returned {len(points)} results")
-                print(f"[VECTOR_STORE] Timing breakdown:")
-                print(f"[VECTOR_STORE]   • Total call: {total_call_time:.2f}ms")
-                print(f"[VECTOR_STORE]   • Qdrant server: {qdrant_server_time:.2f}ms")
-                print(f"[VECTOR_STORE]     ├─ Embedding (est): {estimated_embedding_time:.2f}ms")
-                print(f"[VECTOR_STORE]     └─ Search (est): {estimated_search_time:.2f}ms")
-                print(f"[VECTOR_STORE]   • Network: {network_time:.2f}ms")
-                if usage:
-                    print(f"[VECTOR_STORE] Inference usage: {usage}")
-                
-                if points:
-                    print(f"[VECTOR_STORE] First result score: {points[0].get('score')}")
-                
-                # Return results with timing metadata
-                results_list = [
-                    {
-                        "id": str(hit["id"]),
-                        "score": hit["score"],
-                        "payload": hit.get("payload", {})
-                    }
-                    for hit in points
-                ]
-                
-                # Attach timing metadata to first result if exists
-                if results_list:
-                    results_list[0]["_qdrant_time_ms"] = qdrant_server_time
-                    results_list[0]["_embedding_est_ms"] = estimated_embedding_time
-                    results_list[0]["_search_est_ms"] = estimated_search_time
-                    results_list[0]["_network_ms"] = network_time
-                    results_list[0]["_usage"] = usage
-                
-                return results_list
+            network_start = time.time()
+            response = await self.http_client.post(url, json=data, headers=headers)
+            total_call_time = (time.time() - network_start) * 1000
+            
+            print(f"[VECTOR_STORE] Response status: {response.status_code}")
+            
+            if response.status_code != 200:
+                print(f"[VECTOR_STORE] Cloud query failed: {response.status_code} - {response.text}")
+                raise Exception(f"Qdrant query failed: {response.status_code} - {response.text}")
+            
+            result = response.json()
+            points = result.get("result", {}).get("points", [])
+            qdrant_server_time = result.get("time", 0) * 1000  # Qdrant's reported server time
+            network_time = total_call_time - qdrant_server_time
+            usage = result.get("usage", {})
+            
+            # Estimate embedding vs search time based on typical ratios
+            # Embedding typically takes 60-70% of Qdrant server time
+            estimated_embedding_time = qdrant_server_time * 0.65
+            estimated_search_time = qdrant_server_time * 0.35
+            
+            print(f"[VECTOR_STORE] Cloud query returned {len(points)} results")
+            print(f"[VECTOR_STORE] Timing breakdown:")
+            print(f"[VECTOR_STORE]   • Total call: {total_call_time:.2f}ms")
+            print(f"[VECTOR_STORE]   • Qdrant server: {qdrant_server_time:.2f}ms")
+            print(f"[VECTOR_STORE]     ├─ Embedding (est): {estimated_embedding_time:.2f}ms")
+            print(f"[VECTOR_STORE]     └─ Search (est): {estimated_search_time:.2f}ms")
+            print(f"[VECTOR_STORE]   • Network: {network_time:.2f}ms")
+            if usage:
+                print(f"[VECTOR_STORE] Inference usage: {usage}")
+            
+            if points:
+                print(f"[VECTOR_STORE] First result score: {points[0].get('score')}")
+            
+            # Return results with timing metadata
+            results_list = [
+                {
+                    "id": str(hit["id"]),
+                    "score": hit["score"],
+                    "payload": hit.get("payload", {})
+                }
+                for hit in points
+            ]
+            
+            # Attach timing metadata to first result if exists
+            if results_list:
+                results_list[0]["_qdrant_time_ms"] = qdrant_server_time
+                results_list[0]["_embedding_est_ms"] = estimated_embedding_time
+                results_list[0]["_search_est_ms"] = estimated_search_time
+                results_list[0]["_network_ms"] = network_time
+                results_list[0]["_usage"] = usage
+            
+            return results_list
         else:
-            # Use MMR if requested
-            if use_mmr:
-                from qdrant_client import models
-                loop = asyncio.get_event_loop()
-                results = await loop.run_in_executor(
-                    None,
-                    lambda: self.client.query_points(
-                        collection_name=collection_name,
-                        query=models.Query(
-                            nearest=models.Nearest(
-                                vector=query_vector
-                            ),
-                            mmr=models.Mmr(
-                                diversity=diversity,  # 0.0 = relevance, 1.0 = diversity
-                                candidates_limit=min(100, top_k * 10)  # get more candidates for diversity
-                            )
-                        ),
-                        limit=top_k,
-                        query_filter=search_filter
-                    )
-                )
-            else:
-                # Traditional vector search
-                loop = asyncio.get_event_loop()
-                results = await loop.run_in_executor(
-                    None,
-                    lambda: self.client.search(
-                        collection_name=collection_name,
-                        query_vector=query_vector,
-                        limit=top_k,
-                        query_filter=search_filter
-                    )
-                )
+            # Vector search, MMR-diversified if requested
+            response = await self.client.query_points(
+                collection_name=collection_name,
+                query=self._build_query(query_vector, top_k, use_mmr, diversity),
+                limit=top_k,
+                query_filter=search_filter,
+                search_params=search_params
+            )
+            results = response.points
         
         return [
             {
@@ -307,28 +544,110 @@ class QdrantVectorStore(VectorStore):
             for hit in results
         ]
     
+    async def search_batch(
+        self,
+        collection_name: str,
+        query_vectors: Vectors,
+        top_k: int = 5,
+        filter_conditions: Optional[Dict[str, Any]] = None,
+        query_texts: Optional[List[str]] = None,
+        use_mmr: bool = False,
+        diversity: float = 0.5,
+        oversampling: Optional[float] = None,
+        rescore: Optional[bool] = None,
+        exclude_conditions: Optional[Dict[str, Any]] = None
+    ) -> List[List[Dict[str, Any]]]:
+        """Search several queries with one batch query request"""
+        from qdrant_client import models
+        
+        search_params = self._search_params(oversampling, rescore)
+        search_filter = self._build_filter(filter_conditions, exclude_conditions)
+        
+        # Cloud inference: the REST batch endpoint embeds every query text server-side
+        if self.cloud_inference and query_texts:
+            url = f"{self.client._client.rest_uri}/collections/{collection_name}/points/query/batch"
+            headers = {
+                "Content-Type": "application/json",
+                "api-key": self.api_key or ""
+            }
+            
+            searches = []
+            for query_text in query_texts:
+                search = {
+                    "query": {
+                        "text": query_text,
+                        "model": "sentence-transformers/all-minilm-l6-v2"
+                    },
+                    "limit": top_k,
+                    "with_payload": True
+                }
+                if search_filter is not None:
+                    search["filter"] = search_filter.model_dump(exclude_none=True)
+                if search_params is not None:
+                    search["params"] = search_params.model_dump(exclude_none=True)
+                searches.append(search)
+            
+            network_start = time.time()
+            response = await self.http_client.post(url, json={"searches": searches}, headers=headers)
+            total_call_time = (time.time() - network_start) * 1000
+            
+            if response.status_code != 200:
+                print(f"[VECTOR_STORE] Cloud batch query failed: {response.status_code} - {response.text}")
+                raise Exception(f"Qdrant batch query failed: {response.status_code} - {response.text}")
+            
+            batches = response.json().get("result", [])
+            print(f"[VECTOR_STORE] Cloud batch query: {len(searches)} queries in {total_call_time:.2f}ms")
+            return [
+                [
+                    {
+                        "id": str(hit["id"]),
+                        "score": hit["score"],
+                        "payload": hit.get("payload", {})
+                    }
+                    for hit in batch.get("points", [])
+                ]
+                for batch in batches
+            ]
+        
+        requests = [
+            models.QueryRequest(
+                query=self._build_query(query_vector, top_k, use_mmr, diversity),
+                filter=search_filter,
+                params=search_params,
+                limit=top_k,
+                with_payload=True
+            )
+            for query_vector in query_vectors
+        ]
+        responses = await self.client.query_batch_points(
+            collection_name=collection_name,
+            requests=requests
+        )
+        
+        return [
+            [
+                {
+                    "id": str(hit.id),
+                    "score": hit.score,
+                    "payload": hit.payload
+                }
+                for hit in response.points
+            ]
+            for response in responses
+        ]
+    
     async def delete(self, collection_name: str, ids: List[str]):
         """Delete vectors by ID"""
-        import asyncio
-        loop = asyncio.get_event_loop()
-        await loop.run_in_executor(
-            None,
-            lambda: self.client.delete(
-                collection_name=collection_name,
-                points_selector=ids
-            )
+        await self.client.delete(
+            collection_name=collection_name,
+            points_selector=ids
         )
     
     async def get_by_id(self, collection_name: str, point_id: str) -> Optional[Dict[str, Any]]:
         """Get a vector by ID"""
-        import asyncio
-        loop = asyncio.get_event_loop()
-        result = await loop.run_in_executor(
-            None,
-            lambda: self.client.retrieve(
-                collection_name=collection_name,
-                ids=[point_id]
-            )
+        result = await self.client.retrieve(
+            collection_name=collection_name,
+            ids=[point_id]
         )
         
         if result:
@@ -341,3 +660,95 @@ class QdrantVectorStore(VectorStore):
         return None
 
 
+
+
+_local_store: Optional[VectorStore] = None
+_http_client = None
+
+
+def create_http_client(
+    http2: bool = True,
+    max_connections: int = 20,
+    max_keepalive_connections: int = 10,
+    keepalive_expiry: float = 30.0,
+    connect_timeout: float = 5.0,
+    read_timeout: float = 30.0
+):
+    """Pooled keep-alive HTTP client for cloud-inference REST calls"""
+    import httpx
+    return httpx.AsyncClient(
+        http2=http2,
+        limits=httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+            keepalive_expiry=keepalive_expiry
+        ),
+        timeout=httpx.Timeout(read_timeout, connect=connect_timeout)
+    )
+
+
+def get_http_client(settings):
+    """The process-wide HTTP client, created on first use from settings"""
+    global _http_client
+    if _http_client is None or _http_client.is_closed:
+        _http_client = create_http_client(
+            http2=settings.qdrant_http2,
+            max_connections=settings.qdrant_http_max_connections,
+            max_keepalive_connections=settings.qdrant_http_max_keepalive,
+            keepalive_expiry=settings.qdrant_http_keepalive_expiry,
+            connect_timeout=settings.qdrant_http_connect_timeout,
+            read_timeout=settings.qdrant_http_read_timeout
+        )
+    return _http_client
+
+
+async def close_http_client():
+    """Close the process-wide HTTP client, called on application shutdown"""
+    global _http_client
+    if _http_client is not None:
+        await _http_client.aclose()
+        _http_client = None
+
+
+def create_vector_store(settings) -> VectorStore:
+    """Build the vector store backend selected in settings
+
+    The local store lives in process memory, so a single instance is shared
+    by every caller instead of one per request.
+    """
+    global _local_store
+    if settings.use_mock_vector_store:
+        if _local_store is None:
+            from app.services.local_vector_store import LocalVectorStore
+            index_params = {
+                "hnsw": {
+                    "m": settings.hnsw_m,
+                    "ef_construct": settings.hnsw_ef_construct,
+                    "ef_search": settings.hnsw_ef_search
+                },
+                "ivfpq": {
+                    "nlist": settings.ivfpq_nlist,
+                    "pq_m": settings.ivfpq_m,
+                    "nprobe": settings.ivfpq_nprobe,
+                    "rerank": settings.ivfpq_rerank
+                }
+            }
+            _local_store = LocalVectorStore(
+                settings.local_store_path,
+                index=settings.local_index,
+                index_params=index_params.get(settings.local_index),
+                full_scan_threshold=settings.local_full_scan_threshold
+            )
+        return _local_store
+    
+    return QdrantVectorStore(
+        settings.qdrant_url,
+        settings.qdrant_api_key,
+        cloud_inference=settings.qdrant_cloud_inference,
+        profile=settings.qdrant_collection_profile,
+        oversampling=settings.qdrant_oversampling,
+        rescore=settings.qdrant_rescore,
+        http_client=get_http_client(settings),
+        prefer_grpc=settings.qdrant_prefer_grpc,
+        grpc_port=settings.qdrant_grpc_port
+    )
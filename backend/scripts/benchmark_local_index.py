@@ -0,0 +1,203 @@
+"""
+Benchmark LocalVectorStore ANN indexes (HNSW, IVF-PQ) against exact search on the Wikipedia parquet
+"""
+import sys
+import os
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import asyncio
+import gc
+import time
+import numpy as np
+import pandas as pd
+from app.services.local_vector_store import LocalVectorStore
+
+
+COLLECTION = "benchmark"
+
+
+def _parse_ints(value: str):
+    return [int(v) for v in value.split(",") if v.strip()]
+
+
+def _rss_mb() -> float:
+    """Resident set size of this process in MB (peak RSS where /proc is missing)"""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 1e6
+    except (OSError, ValueError):
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak / (1e6 if sys.platform == "darwin" else 1e3)
+
+
+async def _build(store: LocalVectorStore, vectors: np.ndarray, batch_size: int = 256) -> float:
+    """Load the corpus into a store and wait for its index, returns build time in seconds"""
+    await store.create_collection(COLLECTION, vectors.shape[1])
+    start = time.time()
+    for i in range(0, len(vectors), batch_size):
+        batch = vectors[i:i + batch_size]
+        await store.upsert_vectors(
+            collection_name=COLLECTION,
+            vectors=batch,
+            payloads=[{"row": i + j} for j in range(len(batch))],
+            ids=list(range(i, i + len(batch)))
+        )
+    await store.wait_for_index(COLLECTION)
+    return time.time() - start
+
+
+async def _run_queries(store: LocalVectorStore, queries: np.ndarray, top_k: int):
+    """Return (result id sets, latencies in ms) for every query"""
+    results = []
+    latencies = []
+    for query in queries:
+        start = time.perf_counter()
+        hits = await store.search(COLLECTION, query, top_k)
+        latencies.append((time.perf_counter() - start) * 1000)
+        results.append({hit["id"] for hit in hits})
+    return results, np.array(latencies)
+
+
+def _report(label: str, build_s: float, rss_mb: float, truth, results, latencies):
+    recall = np.mean([len(t & r) / max(len(t), 1) for t, r in zip(truth, results)])
+    print(
+        f"{label:<28} {build_s:>8.1f}s {rss_mb:>9.0f} {recall:>9.4f} "
+        f"{latencies.mean():>8.3f} {np.percentile(latencies, 50):>8.3f} {np.percentile(latencies, 99):>8.3f}"
+    )
+
+
+async def benchmark(
+    parquet_path: str,
+    num_queries: int,
+    top_k: int,
+    indexes,
+    ms,
+    ef_construct: int,
+    ef_searches,
+    nlist: int,
+    pq_ms,
+    nprobes,
+    rerank: int
+):
+    print("=" * 70)
+    print("Local Index Benchmark: recall vs latency")
+    print("=" * 70)
+    print(f"File: {parquet_path}")
+
+    df = pd.read_parquet(parquet_path)
+    vectors = np.stack(df["embedding"].to_numpy()).astype(np.float32)
+
+    # Hold out the last rows as queries so they are not in the index themselves
+    corpus, queries = vectors[:-num_queries], vectors[-num_queries:]
+    print(f"Corpus: {len(corpus)} x {corpus.shape[1]} | Queries: {len(queries)} | top_k: {top_k}")
+    del df
+    gc.collect()
+    print(f"Process RSS with corpus loaded: {_rss_mb():.0f} MB")
+    print()
+
+    header = (
+        f"{'config':<28} {'build':>9} {'RSS MB':>9} {'recall@' + str(top_k):>9} "
+        f"{'mean ms':>8} {'p50 ms':>8} {'p99 ms':>8}"
+    )
+    print(header)
+    print("-" * len(header))
+
+    exact = LocalVectorStore()
+    build_s = await _build(exact, corpus)
+    truth, latencies = await _run_queries(exact, queries, top_k)
+    _report("flat (exact)", build_s, _rss_mb(), truth, truth, latencies)
+    del exact
+
+    for m in (ms if "hnsw" in indexes else []):
+        store = LocalVectorStore(
+            index="hnsw",
+            index_params={"m": m, "ef_construct": ef_construct},
+            full_scan_threshold=0  # Always go through the graph
+        )
+        gc.collect()
+        build_s = await _build(store, corpus)
+        index = store.collections[COLLECTION].index
+        rss_mb = _rss_mb()
+
+        for ef_search in ef_searches:
+            index.ef_search = ef_search
+            results, latencies = await _run_queries(store, queries, top_k)
+            _report(f"hnsw m={m} ef={ef_search}", build_s, rss_mb, truth, results, latencies)
+        del store, index
+
+    for pq_m in (pq_ms if "ivfpq" in indexes else []):
+        store = LocalVectorStore(
+            index="ivfpq",
+            index_params={"nlist": nlist, "pq_m": pq_m, "rerank": rerank, "min_train": len(corpus)},
+            full_scan_threshold=0
+        )
+        gc.collect()
+        build_s = await _build(store, corpus)
+        index = store.collections[COLLECTION].index
+        rss_mb = _rss_mb()
+
+        for nprobe in nprobes:
+            index.nprobe = nprobe
+            results, latencies = await _run_queries(store, queries, top_k)
+            _report(f"ivfpq m={pq_m} probe={nprobe}", build_s, rss_mb, truth, results, latencies)
+        del store, index
+
+    print()
+    print("RSS MB is the whole process after the build, corpus included; freed stores are not")
+    print("always handed back to the OS, so compare configs run alone for exact figures.")
+    print("These stores are in memory: IVF-PQ only keeps full vectors on disk with LOCAL_STORE_PATH.")
+    print("Pick the cheapest setting that meets your recall target, then set LOCAL_INDEX and")
+    print("the matching HNSW_* or IVFPQ_* values in backend/.env")
+    print("=" * 70)
+
+
+def main():
+    """Main entry point"""
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description="Benchmark local ANN indexes against exact search"
+    )
+    parser.add_argument(
+        "--file",
+        type=str,
+        default="/Users/thierrydamiba/agent/train-00000-of-00001.parquet",
+        help="Path to parquet file with an 'embedding' column"
+    )
+    parser.add_argument("--num-queries", type=int, default=200, help="Rows held out as queries")
+    parser.add_argument("--top-k", type=int, default=10, help="Results per query")
+    parser.add_argument("--index", type=str, default="hnsw,ivfpq", help="Comma-separated indexes to compare")
+    parser.add_argument("--m", type=str, default="8,16,32", help="Comma-separated HNSW m values")
+    parser.add_argument("--ef-construct", type=int, default=100, help="HNSW ef_construct")
+    parser.add_argument("--ef-search", type=str, default="16,32,64,128", help="Comma-separated ef_search values")
+    parser.add_argument("--nlist", type=int, default=64, help="IVF-PQ coarse clusters")
+    parser.add_argument("--pq-m", type=str, default="48,96", help="Comma-separated IVF-PQ code sizes (bytes)")
+    parser.add_argument("--nprobe", type=str, default="4,8,16", help="Comma-separated IVF-PQ nprobe values")
+    parser.add_argument("--rerank", type=int, default=100, help="IVF-PQ candidates re-ranked exactly")
+
+    args = parser.parse_args()
+
+    if not os.path.exists(args.file):
+        print(f"Error: File not found: {args.file}")
+        sys.exit(1)
+
+    asyncio.run(benchmark(
+        args.file,
+        args.num_queries,
+        args.top_k,
+        [i.strip() for i in args.index.split(",")],
+        _parse_ints(args.m),
+        args.ef_construct,
+        _parse_ints(args.ef_search),
+        args.nlist,
+        _parse_ints(args.pq_m),
+        _parse_ints(args.nprobe),
+        args.rerank
+    ))
+
+
+if __name__ == "__main__":
+    main()
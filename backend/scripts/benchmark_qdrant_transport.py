@@ -0,0 +1,134 @@
+"""
+Benchmark QdrantVectorStore over REST vs gRPC (upsert, search, retrieve, delete)
+"""
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import asyncio
+import time
+import uuid
+import numpy as np
+from app.core.config import settings
+from app.services.vector_store import QdrantVectorStore
+
+
+COLLECTION = "transport_benchmark"
+
+
+def _stats(latencies) -> str:
+    latencies = np.array(latencies)
+    return (
+        f"{latencies.mean():>8.2f} {np.percentile(latencies, 50):>8.2f} "
+        f"{np.percentile(latencies, 99):>8.2f}"
+    )
+
+
+async def _timed(call) -> float:
+    """Run one awaitable factory, returns latency in ms"""
+    start = time.perf_counter()
+    await call()
+    return (time.perf_counter() - start) * 1000
+
+
+async def _run(store: QdrantVectorStore, vectors: np.ndarray, queries: np.ndarray, top_k: int, batch_size: int):
+    """Time every operation for one transport, returns {operation: [latencies ms]}"""
+    ids = [str(uuid.uuid4()) for _ in range(len(vectors))]
+    timings = {"upsert": [], "search": [], "retrieve": [], "delete": []}
+
+    for i in range(0, len(vectors), batch_size):
+        batch = slice(i, i + batch_size)
+        timings["upsert"].append(await _timed(lambda: store.upsert_vectors(
+            collection_name=COLLECTION,
+            vectors=vectors[batch],
+            payloads=[{"row": i + j} for j in range(len(vectors[batch]))],
+            ids=ids[batch]
+        )))
+
+    for query in queries:
+        timings["search"].append(await _timed(
+            lambda: store.search(COLLECTION, query, top_k)
+        ))
+
+    for point_id in ids[:len(queries)]:
+        timings["retrieve"].append(await _timed(
+            lambda: store.get_by_id(COLLECTION, point_id)
+        ))
+
+    for i in range(0, len(ids), batch_size):
+        timings["delete"].append(await _timed(
+            lambda: store.delete(COLLECTION, ids[i:i + batch_size])
+        ))
+
+    return timings
+
+
+async def benchmark(num_points: int, num_queries: int, dim: int, top_k: int, batch_size: int):
+    print("=" * 70)
+    print("Qdrant Transport Benchmark: REST vs gRPC")
+    print("=" * 70)
+    print(f"Qdrant: {settings.qdrant_url} (gRPC port {settings.qdrant_grpc_port})")
+    print(f"Points: {num_points} x {dim} | Queries: {num_queries} | top_k: {top_k} | batch: {batch_size}")
+    print()
+
+    rng = np.random.default_rng(42)
+    vectors = rng.standard_normal((num_points, dim)).astype(np.float32)
+    queries = rng.standard_normal((num_queries, dim)).astype(np.float32)
+
+    results = {}
+    for transport, prefer_grpc in (("rest", False), ("grpc", True)):
+        # Pre-computed vectors only: cloud inference always goes over REST
+        store = QdrantVectorStore(
+            settings.qdrant_url,
+            settings.qdrant_api_key,
+            prefer_grpc=prefer_grpc,
+            grpc_port=settings.qdrant_grpc_port
+        )
+        try:
+            await store.create_collection(COLLECTION, dim)
+            # One warm-up call so connection setup is not counted
+            await store.search(COLLECTION, queries[0], top_k)
+            results[transport] = await _run(store, vectors, queries, top_k, batch_size)
+        finally:
+            await store.client.delete_collection(COLLECTION)
+            await store.close()
+
+    header = f"{'operation':<10} {'transport':<10} {'mean ms':>8} {'p50 ms':>8} {'p99 ms':>8}"
+    print(header)
+    print("-" * len(header))
+    for operation in ("upsert", "search", "retrieve", "delete"):
+        for transport in ("rest", "grpc"):
+            print(f"{operation:<10} {transport:<10} {_stats(results[transport][operation])}")
+
+    print()
+    print("If gRPC wins on your deployment, set QDRANT_PREFER_GRPC=true in backend/.env")
+    print("=" * 70)
+
+
+def main():
+    """Main entry point"""
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description="Compare QdrantVectorStore latency over REST and gRPC"
+    )
+    parser.add_argument("--num-points", type=int, default=5000, help="Points to upsert")
+    parser.add_argument("--num-queries", type=int, default=200, help="Searches and retrieves to time")
+    parser.add_argument("--dim", type=int, default=384, help="Vector size")
+    parser.add_argument("--top-k", type=int, default=10, help="Results per search")
+    parser.add_argument("--batch-size", type=int, default=100, help="Points per upsert/delete call")
+
+    args = parser.parse_args()
+
+    asyncio.run(benchmark(
+        args.num_points,
+        args.num_queries,
+        args.dim,
+        args.top_k,
+        args.batch_size
+    ))
+
+
+if __name__ == "__main__":
+    main()
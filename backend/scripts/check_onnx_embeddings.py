@@ -0,0 +1,96 @@
+"""
+Check that the ONNX Runtime embedding backends match the PyTorch model
+
+Encodes the same texts with every backend and compares each ONNX vector to
+the SentenceTransformer one. Exits non-zero if any backend falls below its
+cosine tolerance, so it can gate EMBEDDING_BACKEND changes.
+"""
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import time
+import numpy as np
+from app.core.config import settings
+from app.services.document_processor import EmbeddingService
+
+
+# Minimum cosine similarity to the PyTorch embedding, per backend
+TOLERANCES = {
+    "onnx": 0.9999,
+    "onnx-int8": 0.99,
+}
+
+SAMPLE_TEXTS = [
+    "What is retrieval-augmented generation?",
+    "Qdrant is a vector similarity search engine.",
+    "The mitochondria is the powerhouse of the cell.",
+    "How do I reset my password?",
+    "Quarterly revenue grew 12% year over year, driven by cloud subscriptions.",
+    "Paris is the capital and most populous city of France.",
+    "short",
+    "A much longer passage that keeps going so that padding and truncation are exercised: " * 20,
+]
+
+
+def _encode(backend: str, texts, repeats: int):
+    """Embeddings and mean ms per text for one backend (caches off, model warmed)"""
+    service = EmbeddingService(settings.text_embedding_model, backend=backend, cache_size=0)
+    service.embed_array(texts[:1])
+    start = time.perf_counter()
+    for _ in range(repeats):
+        vectors = service.embed_array(texts)
+    ms_per_text = (time.perf_counter() - start) * 1000 / (repeats * len(texts))
+    return vectors, ms_per_text
+
+
+def main():
+    """Main entry point"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Compare ONNX embedding backends with PyTorch")
+    parser.add_argument("--file", type=str, help="Optional text file, one passage per line")
+    parser.add_argument("--limit", type=int, default=500, help="Max passages read from --file")
+    parser.add_argument("--repeats", type=int, default=3, help="Timed passes per backend")
+    args = parser.parse_args()
+
+    texts = list(SAMPLE_TEXTS)
+    if args.file:
+        with open(args.file, encoding="utf-8") as f:
+            texts += [line.strip() for line in f if line.strip()][:args.limit]
+
+    print("=" * 70)
+    print(f"Embedding backend check: {settings.text_embedding_model} ({len(texts)} texts)")
+    print("=" * 70)
+
+    reference, torch_ms = _encode("torch", texts, args.repeats)
+    print(f"{'backend':<12} {'min cos':>10} {'mean cos':>10} {'max |diff|':>11} {'ms/text':>9} {'speedup':>8}")
+    print(f"{'torch':<12} {1.0:>10.6f} {1.0:>10.6f} {0.0:>11.6f} {torch_ms:>9.3f} {1.0:>7.2f}x")
+
+    failed = []
+    for backend, tolerance in TOLERANCES.items():
+        vectors, ms = _encode(backend, texts, args.repeats)
+        cosines = (vectors * reference).sum(axis=1) / (
+            np.linalg.norm(vectors, axis=1) * np.linalg.norm(reference, axis=1)
+        )
+        max_diff = np.abs(vectors - reference).max()
+        print(
+            f"{backend:<12} {cosines.min():>10.6f} {cosines.mean():>10.6f} {max_diff:>11.6f} "
+            f"{ms:>9.3f} {torch_ms / ms:>7.2f}x"
+        )
+        if cosines.min() < tolerance:
+            failed.append(f"{backend}: min cosine {cosines.min():.6f} < {tolerance}")
+
+    print()
+    if failed:
+        print("❌ Tolerance check failed:")
+        for line in failed:
+            print(f"   {line}")
+        sys.exit(1)
+    print("✅ All backends within tolerance - safe to set EMBEDDING_BACKEND for existing collections")
+    print("=" * 70)
+
+
+if __name__ == "__main__":
+    main()
@@ -12,7 +12,7 @@ import asyncio
 import pandas as pd
 from tqdm import tqdm
 from app.core.config import settings
-from app.services.vector_store import MockVectorStore, QdrantVectorStore
+from app.services.vector_store import create_vector_store
 import uuid
 from datetime import datetime
 
@@ -36,11 +36,12 @@ async def load_from_parquet(parquet_path: str, num_articles: int = 100):
     
     # Initialize vector store
     print("[1/5] Initializing vector store...")
-    if settings.use_mock_vector_store:
-        vector_store = MockVectorStore()
-        print("      ⚠️  Using MockVectorStore - data won't persist after restart!")
+    vector_store = create_vector_store(settings)
+    if settings.use_mock_vector_store and settings.local_store_path:
+        print(f"      ✓ Using LocalVectorStore persisted at {settings.local_store_path}")
+    elif settings.use_mock_vector_store:
+        print("      ⚠️  Using LocalVectorStore - data won't persist after restart!")
     else:
-        vector_store = QdrantVectorStore(settings.qdrant_url, settings.qdrant_api_key)
         print(f"      ✓ Connected to Qdrant at {settings.qdrant_url}")
     print()
     
@@ -172,9 +173,9 @@ async def load_from_parquet(parquet_path: str, num_articles: int = 100):
     print("  -d '{\"query\":\"What is Python?\",\"mode\":\"local\",\"top_k\":3}'")
     print()
     
-    if settings.use_mock_vector_store:
+    if settings.use_mock_vector_store and not settings.local_store_path:
         print("=" * 70)
-        print("⚠️  MockVectorStore Active - Data in Memory Only")
+        print("⚠️  LocalVectorStore Active - Data in Memory Only")
         print("=" * 70)
         print("Data will be LOST when backend restarts!")
         print("Keep backend running to query the data.")
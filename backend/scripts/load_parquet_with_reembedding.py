@@ -29,8 +29,17 @@ async def load_and_reembed(parquet_path: str, num_articles: int = 100):
     
     # Initialize services
     print("[1/5] Initializing...")
-    vector_store = QdrantVectorStore(settings.qdrant_url, settings.qdrant_api_key)
-    embedding_service = EmbeddingService(settings.text_embedding_model)
+    vector_store = QdrantVectorStore(
+        settings.qdrant_url,
+        settings.qdrant_api_key,
+        profile=settings.qdrant_collection_profile
+    )
+    embedding_service = EmbeddingService(
+        settings.text_embedding_model,
+        backend=settings.embedding_backend,
+        store_path=settings.embedding_store_path,
+        token_budget=settings.embedding_token_budget
+    )
     print(f"      ✓ Qdrant at {settings.qdrant_url}")
     print(f"      ✓ Embedding model: {settings.text_embedding_model} (384-dim)")
     print()
@@ -50,7 +59,7 @@ async def load_and_reembed(parquet_path: str, num_articles: int = 100):
     # Delete and recreate to ensure clean slate
     try:
         await asyncio.sleep(0)  # Make async
-        vector_store.client.delete_collection(text_collection)
+        vector_store.sync_client.delete_collection(text_collection)
         print(f"      ✓ Deleted old {text_collection}")
     except:
         pass
@@ -66,7 +75,7 @@ async def load_and_reembed(parquet_path: str, num_articles: int = 100):
     print()
     
     # Batch process for speed
-    batch_size = 10
+    batch_size = 256  # Embedded in length-sorted buckets by embed_bulk
     total_uploaded = 0
     
     for batch_start in tqdm(range(0, len(df), batch_size), desc="Batches"):
@@ -97,16 +106,14 @@ async def load_and_reembed(parquet_path: str, num_articles: int = 100):
             continue
         
         # Batch embed
-        embeddings = embedding_service.embed_text(texts)
+        embeddings = embedding_service.embed_bulk(texts)
         
-        # Upload batch
-        vectors = []
+        # Upload batch (the float32 matrix is passed through as-is)
         payloads = []
         ids = []
         
-        for meta, embedding in zip(metadata, embeddings):
+        for meta in metadata:
             ids.append(meta["idx"])
-            vectors.append(embedding)
             payloads.append({
                 "doc_id": meta["doc_id"],
                 "filename": f"{meta['title']}.txt",
@@ -119,12 +126,12 @@ async def load_and_reembed(parquet_path: str, num_articles: int = 100):
         
         await vector_store.upsert_vectors(
             collection_name=text_collection,
-            vectors=vectors,
+            vectors=embeddings,
             payloads=payloads,
             ids=ids
         )
         
-        total_uploaded += len(vectors)
+        total_uploaded += len(ids)
     
     print()
     print("[5/5] Summary")
@@ -13,7 +13,7 @@ import asyncio
 from datasets import load_dataset
 from tqdm import tqdm
 from app.core.config import settings
-from app.services.vector_store import QdrantVectorStore
+from app.services.vector_store import create_vector_store
 from app.services.document_processor import EmbeddingService
 import uuid
 from datetime import datetime
@@ -36,24 +36,24 @@ async def load_simple_wikipedia(num_articles: int = 1000):
     
     # Initialize services
     print("[1/6] Initializing services...")
+    vector_store = create_vector_store(settings)
     if settings.use_mock_vector_store:
-        # Mock store not implemented - use Qdrant instead
-        print("      ⚠️  Mock store requested but not implemented, using Qdrant!")
-    
-    vector_store = QdrantVectorStore(
-        settings.qdrant_url, 
-        settings.qdrant_api_key,
-        cloud_inference=settings.qdrant_cloud_inference
-    )
-    print(f"      ✓ Connected to Qdrant at {settings.qdrant_url}")
+        print("      ✓ Using in-process LocalVectorStore")
+    else:
+        print(f"      ✓ Connected to Qdrant at {settings.qdrant_url}")
     
-    if settings.qdrant_cloud_inference:
+    if vector_store.cloud_inference:
         print("[2/6] Cloud Inference enabled")
         print(f"      ✓ Using Qdrant cloud embeddings (no local model needed)")
         embedding_service = None  # Not needed for cloud inference
     else:
         print("[2/6] Loading embedding models...")
-        embedding_service = EmbeddingService(settings.text_embedding_model)
+        embedding_service = EmbeddingService(
+            settings.text_embedding_model,
+            backend=settings.embedding_backend,
+            store_path=settings.embedding_store_path,
+            token_budget=settings.embedding_token_budget
+        )
         print(f"      ✓ Text model: {settings.text_embedding_model}")
     print()
     
@@ -145,7 +145,7 @@ async def load_simple_wikipedia(num_articles: int = 1000):
                 })
             
             # Upload chunks to vector store
-            if settings.qdrant_cloud_inference:
+            if vector_store.cloud_inference:
                 # Cloud inference: pass texts, Qdrant generates embeddings server-side
                 await vector_store.upsert_vectors(
                     collection_name=text_collection,
@@ -156,7 +156,7 @@ async def load_simple_wikipedia(num_articles: int = 1000):
                 )
             else:
                 # Local mode: generate embeddings locally
-                embeddings = embedding_service.embed_text(texts)
+                embeddings = embedding_service.embed_bulk(texts)
                 await vector_store.upsert_vectors(
                     collection_name=text_collection,
                     vectors=embeddings,
@@ -224,17 +224,20 @@ async def load_simple_wikipedia(num_articles: int = 1000):
     print("     -d '{\"query\":\"What is Python?\",\"mode\":\"local\",\"top_k\":3}'")
     print()
     
-    if settings.use_mock_vector_store:
+    if settings.use_mock_vector_store and not settings.local_store_path:
         print("=" * 70)
-        print("⚠️  IMPORTANT: MockVectorStore Active")
+        print("⚠️  IMPORTANT: LocalVectorStore Active")
         print("=" * 70)
         print("Data is stored IN MEMORY and will be LOST when backend restarts!")
         print()
         print("To persist data:")
         print("1. Set up Qdrant Cloud (see WORKSHOP_SETUP.md)")
         print("2. Update backend/.env: USE_MOCK_VECTOR_STORE=false")
+        print("   (or keep the local store and set LOCAL_STORE_PATH=./data/vectors)")
         print("3. Restart backend and re-run this script")
         print("=" * 70)
+    elif settings.use_mock_vector_store:
+        print(f"✓ Data persisted in {settings.local_store_path} - mapped on backend restart")
     else:
         print("✓ Data persisted in Qdrant - will survive backend restarts")
     
@@ -34,8 +34,17 @@ async def reembed_and_load(parquet_path: str, num_articles: int = 100):
     
     # Initialize services
     print("[2/4] Initializing services...")
-    vector_store = QdrantVectorStore("http://localhost:6333", None)
-    embedding_service = EmbeddingService()
+    vector_store = QdrantVectorStore(
+        "http://localhost:6333",
+        None,
+        profile=settings.qdrant_collection_profile
+    )
+    embedding_service = EmbeddingService(
+        settings.text_embedding_model,
+        backend=settings.embedding_backend,
+        store_path=settings.embedding_store_path,
+        token_budget=settings.embedding_token_budget
+    )
     print("      ✓ Qdrant connected")
     print("      ✓ Embedding model loaded")
     print()
@@ -56,7 +65,7 @@ async def reembed_and_load(parquet_path: str, num_articles: int = 100):
     print()
     
     # Batch process for speed
-    batch_size = 10
+    batch_size = 256  # Embedded in length-sorted buckets by embed_bulk
     total_loaded = 0
     
     for i in tqdm(range(0, len(df), batch_size), desc="Batches"):
@@ -67,7 +76,7 @@ async def reembed_and_load(parquet_path: str, num_articles: int = 100):
         titles = [str(row['title']) for idx, row in batch.iterrows()]
         
         # Generate embeddings
-        embeddings = embedding_service.embed_text(texts)
+        embeddings = embedding_service.embed_bulk(texts)
         
         # Prepare data
         ids = list(range(i, i+len(batch)))
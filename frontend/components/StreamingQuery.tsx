@@ -5,7 +5,7 @@ import { useAuth } from '@/lib/auth-context';
 import { apiClient } from '@/lib/api';
 
 interface StreamEvent {
-  type: 'status' | 'result' | 'error' | 'decision';
+  type: 'status' | 'result' | 'error' | 'decision' | 'token';
   step?: string;
   message?: string;
   time_ms?: number;
@@ -30,6 +30,7 @@ export default function StreamingQuery({ onComplete }: StreamingQueryProps) {
   const [streaming, setStreaming] = useState(false);
   const [events, setEvents] = useState<StreamEvent[]>([]);
   const [result, setResult] = useState<any>(null);
+  const [streamedAnswer, setStreamedAnswer] = useState('');
   const [error, setError] = useState('');
   const [livePerf, setLivePerf] = useState<any>({});
   const [useMmr, setUseMmr] = useState(false);
@@ -46,6 +47,7 @@ export default function StreamingQuery({ onComplete }: StreamingQueryProps) {
     setError('');
     setEvents([]);
     setResult(null);
+    setStreamedAnswer('');
     setLivePerf({});
     setUserFeedback(null);
     setModeSuggestions(null);
@@ -104,6 +106,12 @@ export default function StreamingQuery({ onComplete }: StreamingQueryProps) {
             const eventType = eventMatch[1];
             const eventData = JSON.parse(eventMatch[2]);
 
+            // Answer tokens go to the live answer, not the progress timeline
+            if (eventType === 'token') {
+              setStreamedAnswer((prev) => prev + eventData.text);
+              continue;
+            }
+
             const event: StreamEvent = {
               type: eventType as any,
               ...eventData,
@@ -526,6 +534,20 @@ export default function StreamingQuery({ onComplete }: StreamingQueryProps) {
         </div>
       )}
 
+      {/* Live Answer (while tokens stream in) */}
+      {streaming && streamedAnswer && (
+        <div className="bg-gradient-to-br from-white to-blue-50/30 rounded-xl shadow-xl border-2 border-indigo-200 p-8">
+          <h2 className="text-2xl font-black text-gray-900 flex items-center gap-3 mb-6">
+            <span className="text-3xl">✨</span>
+            AI Answer
+            <span className="inline-block w-2 h-2 bg-indigo-500 rounded-full animate-pulse"></span>
+          </h2>
+          <div className="prose max-w-none">
+            <p className="text-gray-900 whitespace-pre-wrap font-medium text-base leading-relaxed bg-white/50 p-4 rounded-lg border border-gray-200">{streamedAnswer}</p>
+          </div>
+        </div>
+      )}
+
       {/* Final Result */}
       {result && !streaming && (
         <div className="bg-gradient-to-br from-white to-blue-50/30 rounded-xl shadow-xl border-2 border-indigo-200 p-8">